@@ -1,41 +1,48 @@
-import os
-import random
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_groq import ChatGroq
+import asyncio
+import orjson
+import numpy as np
+from langchain_core.prompts import ChatPromptTemplate
+from backend.app.services.llm_service import get_llm
+from backend.app.services.embedding_service import RESUME_INDEX_PATH, PROJECT_INDEX_PATH, load_index, search_reranked, embed_texts
+from backend.app.services import embedding_service
+from backend.app.services.semantic_cache import semantic_cache
 
 # ===== Helper to get random LLM key =====
-def get_random_llm(model="openai/gpt-oss-120b", temperature=0.7):
-    api_keys = [
-        os.getenv("GROQ_API_KEY_1"),
-        os.getenv("GROQ_API_KEY_2"),
-        os.getenv("GROQ_API_KEY_3"),
-        os.getenv("GROQ_API_KEY_4"),
-        os.getenv("GROQ_API_KEY_5"),
-    ]
-    key = random.choice([k for k in api_keys if k])
-    return ChatGroq(api_key=key, model=model, temperature=temperature)
+def get_random_llm(model="openai/gpt-oss-120b", temperature=0.7, json_mode=False):
+    return get_llm(model, temperature, json_mode)
+
+
+# ===== Static prompt prefixes =====
+# Instructions go in the system message so the prefix is byte-identical across
+# calls and can hit the provider's prompt cache; only the user turn varies.
+ROUTER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a routing AI deciding which knowledge base is most relevant to the user query.
+Knowledge bases available:
+1. resume — contains user's education, skills, and experiences.
+2. project — contains GitHub project details and technical summaries.
+
+Decide which knowledge base(s) to use. Answer with either:
+"resume", "project", or "both"."""),
+    ("user", 'Query: "{query}"'),
+])
+
+GRADER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a strict answer evaluator.
+Evaluate if the answer fully and accurately addresses the user's question.
+Reply ONLY with a JSON object exactly of the form
+{{"grade": "pass" | "fail", "feedback": "<one short sentence>"}}"""),
+    ("user", "Question: {question}\nAnswer: {answer}"),
+])
 
 
 # ===== 1️⃣ ROUTER AGENT (LLM-A) =====
-def route_query(user_query: str) -> str:
+@semantic_cache(threshold=0.97)
+async def route_query(user_query: str) -> str:
     """
     Uses LLM-A to decide whether to use 'resume' or 'project' embeddings.
     """
     llm = get_random_llm()
-    prompt = f"""
-    You are a routing AI deciding which knowledge base is most relevant to the user query.
-    Knowledge bases available:
-    1. resume — contains user's education, skills, and experiences.
-    2. project — contains GitHub project details and technical summaries.
-
-    Query: "{user_query}"
-
-    Decide which knowledge base(s) to use. Answer with either:
-    "resume", "project", or "both".
-    """
-
-    resp = llm.invoke(prompt)
+    resp = await llm.ainvoke(ROUTER_PROMPT.format_messages(query=user_query))
     answer = getattr(resp, "content", str(resp)).strip().lower()
     if "project" in answer and "resume" in answer:
         return "both"
@@ -45,34 +52,48 @@ def route_query(user_query: str) -> str:
         return "resume"
 
 
+# ===== Near-duplicate filter =====
+def dedup_docs(docs: list, threshold: float = 0.9) -> list:
+    """
+    Greedily keep docs whose cosine similarity to every already-kept doc is
+    below `threshold`. Vectors come from the on-disk embedding cache.
+    """
+    if len(docs) < 2:
+        return docs
+    vecs = np.vstack(embed_texts([doc.page_content for doc in docs]))
+    sim = vecs @ vecs.T
+    kept = []
+    for i in range(len(docs)):
+        if not kept or sim[i, kept].max() < threshold:
+            kept.append(i)
+    return [docs[i] for i in kept]
+
+
 # ===== 2️⃣ RETRIEVER NODE =====
-def retrieve_answer(user_query: str, source: str) -> str:
+async def retrieve_answer(user_query: str, source: str) -> str:
     """
     Retrieves context and generates a response from the chosen FAISS embedding.
     """
-    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
     llm = get_random_llm(temperature=0.6)
 
-    resume_path = "data/embeddings/resume/resume_index"
-    project_path = "data/embeddings/projects/projects_index"
-
     dbs = []
-    if source in ["resume", "both"] and os.path.exists(resume_path):
-        dbs.append(FAISS.load_local(resume_path, embeddings, allow_dangerous_deserialization=True))
-    if source in ["project", "both"] and os.path.exists(project_path):
-        dbs.append(FAISS.load_local(project_path, embeddings, allow_dangerous_deserialization=True))
+    if source in ["resume", "both"]:
+        dbs.append(load_index(RESUME_INDEX_PATH))
+    if source in ["project", "both"]:
+        dbs.append(load_index(PROJECT_INDEX_PATH))
+    dbs = [db for db in dbs if db is not None]
 
     if not dbs:
         return "⚠️ No embeddings found for the selected source."
 
-    # Combine if both are needed
-    if len(dbs) > 1:
-        all_docs = []
-        for db in dbs:
-            all_docs.extend(db.similarity_search(user_query, k=4))
-        context = "\n\n".join([doc.page_content for doc in all_docs])
-    else:
-        context = "\n\n".join([doc.page_content for doc in dbs[0].similarity_search(user_query, k=4)])
+    # Search all selected indices concurrently
+    results = await asyncio.gather(*[asyncio.to_thread(search_reranked, db, user_query, 4) for db in dbs])
+    docs = [doc for docs in results for doc in docs]
+    if len(results) > 1:
+        # Resume and project chunks often overlap; don't pay tokens twice.
+        # Embedding is CPU-bound on a cache miss; keep it off the event loop
+        docs = await asyncio.to_thread(dedup_docs, docs)
+    context = "\n\n".join([doc.page_content for doc in docs])
 
     prompt = f"""
     You are an AI assistant answering user queries based on provided context.
@@ -86,58 +107,86 @@ def retrieve_answer(user_query: str, source: str) -> str:
     Provide a clear, factual, well-structured answer.
     """
 
-    resp = llm.invoke(prompt)
+    resp = await llm.ainvoke(prompt)
     return getattr(resp, "content", str(resp))
 
 
 # ===== 3️⃣ GRADER AGENT (LLM-B) =====
-def grade_answer(user_query: str, answer: str) -> tuple:
+INVALID_GRADE_FEEDBACK = "Invalid grader output"  # a fail verdict with no usable reason
+
+# Exact keys only: answers differing by a single number must not share a verdict
+@semantic_cache(exact_only=True)
+async def grade_answer(user_query: str, answer: str) -> tuple:
     """
     Uses another LLM (LLM-B) to check if the answer satisfies the query.
     Returns (bool, feedback).
     """
-    llm = get_random_llm(temperature=0.0)
+    llm = get_random_llm(temperature=0.0, json_mode=True)
+    resp = await llm.ainvoke(GRADER_PROMPT.format_messages(question=user_query, answer=answer))
+    text = getattr(resp, "content", str(resp))
+
+    try:
+        result = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return (False, INVALID_GRADE_FEEDBACK)
+    return (result.get("grade", "fail") == "pass", result.get("feedback", ""))
+
+
+# ===== 4️⃣ CORRECTION =====
+async def correct_answer(user_query: str, answer: str, feedback: str = "") -> str:
+    """
+    Produces an improved answer. Without `feedback` it is a blind rewrite, which
+    is what the speculative run started alongside the grader has to work with.
+    """
+    llm = get_random_llm()
+    reason = (f"was graded as insufficient because: {feedback}" if feedback
+              else "may not fully address the user's question")
     prompt = f"""
-    You are a strict answer evaluator.
+    The following answer {reason}.
+    Correct and complete it.
 
     Question: {user_query}
     Answer: {answer}
-
-    Evaluate if the answer fully and accurately addresses the user's question.
-    Reply with JSON:
-    {{
-      "grade": "pass" or "fail",
-      "feedback": "why you graded it so"
-    }}
     """
-    resp = llm.invoke(prompt)
-    text = getattr(resp, "content", str(resp))
-
-    import json, re
-    match = re.search(r'\{[\s\S]*\}', text)
-    if match:
-        try:
-            result = json.loads(match.group(0))
-            return (result.get("grade", "fail") == "pass", result.get("feedback", ""))
-        except:
-            return (False, "Invalid grader output")
-    return (False, "Could not parse grader response.")
+    resp = await llm.ainvoke(prompt)
+    return getattr(resp, "content", str(resp))
 
 
 # ===== MAIN PIPELINE =====
-def agentic_rag_pipeline(user_query: str) -> str:
+async def agentic_rag_pipeline(user_query: str) -> str:
     """
     Orchestrates Agentic RAG flow: router → retriever → grader → loop if needed.
+    A speculative blind retry runs alongside the grader. It is cancelled on pass,
+    and also on a fail with feedback: the correction then re-runs with the grader's
+    reason, trading one round trip for quality. It is only used when the grader
+    gave no usable feedback.
     """
-    source = route_query(user_query)
-    answer = retrieve_answer(user_query, source)
-    passed, feedback = grade_answer(user_query, answer)
-
-    if not passed:
-        # Retry once with adjusted reasoning
-        correction_prompt = f"Your last answer was graded as insufficient because: {feedback}. Please correct it."
-        llm = get_random_llm()
-        resp = llm.invoke(correction_prompt)
-        answer = getattr(resp, "content", str(resp))
-
-    return answer
+    source = await route_query(user_query)
+    answer = await retrieve_answer(user_query, source)
+    speculative = asyncio.ensure_future(correct_answer(user_query, answer))
+    try:
+        passed, feedback = await grade_answer(user_query, answer)
+    except BaseException:
+        speculative.cancel()
+        raise
+
+    if passed:
+        speculative.cancel()
+        return answer
+    if feedback and feedback != INVALID_GRADE_FEEDBACK:
+        speculative.cancel()
+        return await correct_answer(user_query, answer, feedback)
+    return await speculative
+
+
+def run_agentic_rag_pipeline(user_query: str) -> str:
+    """Sync entry point for callers without a running event loop."""
+    return asyncio.run(agentic_rag_pipeline(user_query))
+
+
+def warmup():
+    """Preload embedder, indices and the agent LLM clients once per process."""
+    embedding_service.warmup()
+    get_random_llm()
+    get_random_llm(temperature=0.6)
+    get_random_llm(temperature=0.0, json_mode=True)
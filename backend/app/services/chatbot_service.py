@@ -1,11 +1,9 @@
 # backend/app/services/chatbot_service.py
 
-import os
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_core.prompts import ChatPromptTemplate
-from langchain.chains import create_retrieval_chain, create_stuff_documents_chain
-from langchain_groq import ChatGroq
+from backend.app.services.llm_service import get_llm
+from backend.app.services.embedding_service import RESUME_INDEX_PATH, PROJECT_INDEX_PATH, load_index, index_version
+from backend.app.services.semantic_cache import semantic_cache
 
 
 def query_rag_response(query: str) -> str:
@@ -14,46 +12,39 @@ def query_rag_response(query: str) -> str:
     Updated for new LangChain version (no RetrievalQA).
     """
     try:
-        embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-
-        resume_path = "data/embeddings/resume/resume_index.faiss"
-        project_path = "data/embeddings/projects/projects_index.faiss"
-
-        if os.path.exists(resume_path):
-            db = FAISS.load_local(resume_path, embeddings, allow_dangerous_deserialization=True)
-        elif os.path.exists(project_path):
-            db = FAISS.load_local(project_path, embeddings, allow_dangerous_deserialization=True)
-        else:
+        if load_index(RESUME_INDEX_PATH) is None and load_index(PROJECT_INDEX_PATH) is None:
             return "No embeddings found. Please upload resume or fetch projects first."
 
-        retriever = db.as_retriever(search_type="similarity", search_kwargs={"k": 4})
+        return _answer_query(query)
 
-        # ✅ Groq LLM
-        llm = ChatGroq(
-            api_key=os.getenv("GROQ_API_KEY_1"),
-            model="openai/gpt-oss-120b",
-            temperature=0
-        )
+    except Exception as e:
+        return f"❌ Error: {e}"
 
-        # ✅ Modern prompt style
-        prompt = ChatPromptTemplate.from_template("""
-        You are a helpful assistant using context retrieved from documents.
-        If the answer cannot be found in the context, reply: "I don't know based on available data."
 
-        Context:
-        {context}
+# Cached answers are dropped whenever either index is rebuilt
+@semantic_cache(threshold=0.97, version=lambda: index_version(RESUME_INDEX_PATH, PROJECT_INDEX_PATH))
+def _answer_query(query: str) -> str:
+    """Runs the retrieval chain; errors propagate so they are never cached."""
+    db = load_index(RESUME_INDEX_PATH) or load_index(PROJECT_INDEX_PATH)
+    docs = db.similarity_search(query, k=4)
 
-        Question:
-        {input}
-        """)
+    # ✅ Groq LLM
+    llm = get_llm(model="openai/gpt-oss-120b", temperature=0)
 
-        # ✅ Chains replaced instead of RetrievalQA
-        document_chain = create_stuff_documents_chain(llm, prompt)
-        rag_chain = create_retrieval_chain(retriever, document_chain)
+    # ✅ Modern prompt style
+    prompt = ChatPromptTemplate.from_template("""
+    You are a helpful assistant using context retrieved from documents.
+    If the answer cannot be found in the context, reply: "I don't know based on available data."
 
-        result = rag_chain.invoke({"input": query})
+    Context:
+    {context}
 
-        return result["answer"]
+    Question:
+    {input}
+    """)
 
-    except Exception as e:
-        return f"❌ Error: {e}"
+    # ✅ Stuff retrieved chunks into the prompt directly (raw FAISS store, no retriever)
+    context = "\n\n".join(doc.page_content for doc in docs)
+    result = (prompt | llm).invoke({"context": context, "input": query})
+
+    return getattr(result, "content", str(result))
@@ -1,22 +1,162 @@
 import os
-import json
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
+import orjson
+import hashlib
+import functools
+import importlib.util
+import numpy as np
+from backend.app.services.onnx_embedder import OnnxMiniLMEmbeddings, onnx_model_path
 
-embedding_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+# Use the exported int8 ONNX model when it and onnxruntime are available
+ONNX_MODEL_PATH = onnx_model_path() if importlib.util.find_spec("onnxruntime") else None
+
+@functools.lru_cache(maxsize=1)
+def get_embedder():
+    """
+    Shared MiniLM embedder. torch/sentence-transformers are imported on first
+    use so importing this module stays cheap; call warmup() to pay it upfront.
+    Normalized so query vectors match the batch-encoded document vectors below.
+    """
+    if ONNX_MODEL_PATH:
+        return OnnxMiniLMEmbeddings(ONNX_MODEL_PATH)
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        encode_kwargs={"normalize_embeddings": True},
+    )
+
+EMBED_BATCH_SIZE = 64
+HNSW_M = 32
+IVFPQ_MIN_VECTORS = 10_000  # above this, trade exactness for 8-bit PQ codes
 
 BASE_PATH = "data/embeddings"
 RESUME_PATH = os.path.join(BASE_PATH, "resume")
 PROJECT_PATH = os.path.join(BASE_PATH, "projects")
+RESUME_INDEX_PATH = os.path.join(RESUME_PATH, "resume_index.faiss")
+PROJECT_INDEX_PATH = os.path.join(PROJECT_PATH, "projects_index.faiss")
+# Quantized vectors differ slightly from FP32 ones, so each backend gets its own cache
+EMBED_CACHE_DIR = os.path.join(BASE_PATH, "_cache", "minilm-int8-onnx" if ONNX_MODEL_PATH else "minilm-normalized")
 os.makedirs(RESUME_PATH, exist_ok=True)
 os.makedirs(PROJECT_PATH, exist_ok=True)
+os.makedirs(EMBED_CACHE_DIR, exist_ok=True)
+
+def _cache_path(text_hash: str) -> str:
+    return os.path.join(EMBED_CACHE_DIR, f"{text_hash}.npy")
+
+def _find_uncached_texts(texts: list, hashes: list, vectors: dict) -> list:
+    """Return unique (hash, text) pairs that have no cached vector yet."""
+    seen = set()
+    uncached = []
+    for text, h in zip(texts, hashes):
+        if h not in vectors and h not in seen:
+            seen.add(h)
+            uncached.append((h, text))
+    return uncached
+
+def _encode_batch(texts: list) -> np.ndarray:
+    """Encode texts in one call, sorted by length so each batch pads evenly."""
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    embedder = get_embedder()
+    if isinstance(embedder, OnnxMiniLMEmbeddings):
+        encoded = embedder.encode([texts[i] for i in order], batch_size=EMBED_BATCH_SIZE)
+    else:
+        encoded = embedder.client.encode(
+            [texts[i] for i in order],
+            batch_size=EMBED_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+    vecs = np.empty_like(encoded, dtype="float32")
+    vecs[order] = encoded
+    return vecs
+
+def embed_texts(texts: list) -> list:
+    """Embed texts, reusing vectors cached on disk under the SHA1 of their content."""
+    hashes = [hashlib.sha1(t.encode("utf-8")).hexdigest() for t in texts]
+    vectors = {}
+    for h in set(hashes):
+        if os.path.exists(_cache_path(h)):
+            vectors[h] = np.load(_cache_path(h))
+
+    uncached = _find_uncached_texts(texts, hashes, vectors)
+    if uncached:
+        new_vecs = _encode_batch([t for _, t in uncached])
+        for (h, _), vec in zip(uncached, new_vecs):
+            np.save(_cache_path(h), vec)
+            vectors[h] = vec
+
+    return [vectors[h] for h in hashes]
+
+def _build_ann_index(vecs: np.ndarray):
+    """
+    HNSW graph over 8-bit scalar-quantized vectors for small corpora,
+    IVF-PQ once the corpus is large. Exact FP32 vectors stay in the
+    embedding cache for reranking (see search_reranked).
+    """
+    import faiss  # heavy; only needed once an index is built or loaded
+    d = vecs.shape[1]
+    if len(vecs) > IVFPQ_MIN_VECTORS:
+        quantizer = faiss.IndexFlatL2(d)
+        index = faiss.IndexIVFPQ(quantizer, d, 64, 16, 8)
+    else:
+        index = faiss.IndexHNSWSQ(d, faiss.ScalarQuantizer.QT_8bit, HNSW_M)
+    index.train(vecs)
+    index.add(vecs)
+    return index
+
+def _save_index(texts: list, path: str):
+    """
+    Persist a raw FAISS index plus a JSONL docstore (row i -> texts[i])
+    instead of LangChain's pickle, so loads can be memory-mapped.
+    """
+    import faiss
+    vecs = np.vstack(embed_texts(texts)).astype("float32")
+    index = _build_ann_index(vecs)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "docs.jsonl"), "wb") as f:
+        for text in texts:
+            f.write(orjson.dumps({"page_content": text}) + b"\n")
+    # Written last: its mtime is the load_index cache key
+    faiss.write_index(index, os.path.join(path, "index.faiss"))
+
+def _resume_chunks(resume_data: dict) -> list:
+    """
+    Split a resume into short per-section facts. MiniLM truncates at 256
+    tokens, so one embedding for the whole resume loses most of it.
+    """
+    chunks = []
+    contact = ", ".join(
+        f"{k}: {resume_data[k]}" for k in ("name", "email", "phone", "linkedin", "github") if resume_data.get(k)
+    )
+    if contact:
+        chunks.append(f"Profile: {contact}")
+    for e in resume_data.get("education", []):
+        chunks.append(
+            f"Education: {e.get('degree', '')} at {e.get('institution', '')} ({e.get('period', '')}), "
+            f"CGPA {e.get('cgpa', '')}, {e.get('location', '')}"
+        )
+    for key, label in (("languages", "Languages"), ("tools", "Tools"), ("coursework", "Coursework")):
+        if resume_data.get(key):
+            chunks.append(f"{label}: {', '.join(resume_data[key])}")
+    for x in resume_data.get("experience", []):
+        header = f"Experience: {x.get('role', '')} at {x.get('company', '')} ({x.get('start', '')} – {x.get('end', '')})"
+        chunks.extend(f"{header} — {item}" for item in x.get("items", []) or [""])
+    for a in resume_data.get("achievements", []):
+        chunks.append(f"Achievement: {a.get('title', '')} ({a.get('category', '')}) — {'; '.join(a.get('items', []))}")
+    for p in resume_data.get("projects", []):
+        chunks.append(
+            f"Project: {p.get('title', '')} | Tech: {', '.join(p.get('technologies', []))} | "
+            f"{'; '.join(p.get('features', []))}"
+        )
+    return [c for c in chunks if c.strip()]
 
 def embed_resume_text(resume_data: dict):
-    resume_text = json.dumps(resume_data, ensure_ascii=False, indent=2)
-    index = FAISS.from_texts([resume_text], embedding_model)
-    path = os.path.join(RESUME_PATH, "resume_index.faiss")
-    index.save_local(path)
-    return path
+    chunks = _resume_chunks(resume_data)
+    if not chunks:
+        # Unknown shape: fall back to embedding the raw dump
+        chunks = [orjson.dumps(resume_data, option=orjson.OPT_INDENT_2).decode()]
+    _save_index(chunks, RESUME_INDEX_PATH)
+    return RESUME_INDEX_PATH
 
 def embed_project_summaries(projects: list):
     texts = [
@@ -24,7 +164,72 @@ def embed_project_summaries(projects: list):
         f"Details: {'; '.join(p.get('features', []))}"
         for p in projects
     ]
-    index = FAISS.from_texts(texts, embedding_model)
-    path = os.path.join(PROJECT_PATH, "projects_index.faiss")
-    index.save_local(path)
-    return path
+    _save_index(texts, PROJECT_INDEX_PATH)
+    return PROJECT_INDEX_PATH
+
+def search_reranked(db, query: str, k: int = 4, fetch_k: int = 16):
+    """Fetch `fetch_k` candidates from the quantized index, rerank them with FP32 vectors."""
+    query_vec = np.asarray(get_embedder().embed_query(query), dtype="float32")
+    candidates = db.similarity_search_by_vector(query_vec.tolist(), k=fetch_k)
+    if not candidates:
+        return []
+    vecs = np.vstack(embed_texts([doc.page_content for doc in candidates]))
+    order = np.argsort(-(vecs @ query_vec))[:k]
+    return [candidates[i] for i in order]
+
+class Doc:
+    """Retrieved chunk; exposes `page_content` like a LangChain Document."""
+    __slots__ = ("page_content",)
+
+    def __init__(self, page_content: str):
+        self.page_content = page_content
+
+class TinyDocStore:
+    """
+    Memory-mapped raw FAISS index plus its JSONL docstore (row i -> docs[i]).
+    Replaces LangChain's FAISS wrapper, which only added a pickled docstore.
+    """
+
+    def __init__(self, path: str):
+        import faiss
+        self.index = faiss.read_index(os.path.join(path, "index.faiss"), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        with open(os.path.join(path, "docs.jsonl"), "rb") as f:
+            self.docs = [Doc(orjson.loads(line)["page_content"]) for line in f]
+
+    def similarity_search_by_vector(self, embedding, k: int = 4) -> list:
+        query_vec = np.asarray([embedding], dtype="float32")
+        _, ids = self.index.search(query_vec, min(k, len(self.docs)))
+        return [self.docs[i] for i in ids[0] if i >= 0]
+
+    def similarity_search(self, query: str, k: int = 4) -> list:
+        return self.similarity_search_by_vector(get_embedder().embed_query(query), k)
+
+@functools.lru_cache(maxsize=4)
+def _load_db(path: str, mtime: float):
+    # mtime is part of the cache key so a rebuilt index is reloaded
+    if os.path.exists(os.path.join(path, "docs.jsonl")):
+        return TinyDocStore(path)
+    # Indices saved by older versions via FAISS.save_local
+    from langchain_community.vectorstores import FAISS
+    return FAISS.load_local(path, get_embedder(), allow_dangerous_deserialization=True)
+
+def load_index(path: str):
+    """Return the vector store saved at `path`, or None if it has not been built."""
+    index_file = os.path.join(path, "index.faiss")
+    if not os.path.exists(index_file):
+        return None
+    return _load_db(path, os.path.getmtime(index_file))
+
+def index_version(*paths: str) -> tuple:
+    """mtimes of the given indices (None if not built); changes whenever one is rebuilt."""
+    versions = []
+    for path in paths:
+        index_file = os.path.join(path, "index.faiss")
+        versions.append(os.path.getmtime(index_file) if os.path.exists(index_file) else None)
+    return tuple(versions)
+
+def warmup():
+    """Load the embedder and any built indices so the first query doesn't pay for it."""
+    get_embedder()
+    load_index(RESUME_INDEX_PATH)
+    load_index(PROJECT_INDEX_PATH)
@@ -1,8 +1,18 @@
 import os
-import json
 import time
+import orjson
+import queue
+import hashlib
+import atexit
+import threading
+import contextlib
 from typing import List, Dict
 from datetime import datetime
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+# Lexbor backend: selectolax 1.0 removed the old Modest parser behind selectolax.parser
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -10,20 +20,42 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+APPLY_DELAY = 5  # seconds each worker rests after a job (rate limiting)
+
+# Shared client for browserless form discovery; safe to use from worker threads
+_HTTP = httpx.Client(timeout=10, follow_redirects=True, headers={"User-Agent": USER_AGENT})
+
 class JobApplicationService:
     """
     Automates job applications using Selenium.
     Handles LinkedIn Easy Apply and basic application forms.
+    Headless Chrome instances are kept warm process-wide (at most `max_workers`
+    idle) and quit at exit; visible ones are quit at the end of each batch.
     """
     
-    def __init__(self, headless: bool = False):
+    # Idle drivers per headless flag, shared by every instance in the process
+    _DRIVER_POOLS = {}
+    _ALL_DRIVERS = []
+    _POOL_LOCK = threading.Lock()
+    
+    def __init__(self, headless: bool = False, max_workers: int = 4):
         self.headless = headless
+        self.max_workers = max_workers
         self.driver = None
-        self.applications_log_path = "data/applications_log.json"
+        # LinkedIn applications run one at a time, however many workers there are
+        self._linkedin_lock = threading.Lock()
+        self._linkedin_cookies = []
+        # Credential hash -> cookies of a logged-in LinkedIn session, reused across batches.
+        # Per instance (one per Streamlit session), never shared through the class or the pool.
+        self._linkedin_sessions = {}
+        self.applications_log_path = "data/applications_log.jsonl"
+        self.legacy_log_path = "data/applications_log.json"
         os.makedirs("data", exist_ok=True)
+        self._migrate_legacy_log()
     
-    def init_driver(self):
-        """Initialize Selenium WebDriver."""
+    def _new_driver(self):
+        """Create a configured Chrome WebDriver."""
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument("--headless")
@@ -32,22 +64,117 @@ class JobApplicationService:
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         
         # Set user agent to appear more human
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.maximize_window()
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.maximize_window()
+        # Misses should return immediately; waits are explicit where needed
+        driver.implicitly_wait(0)
+        with self._POOL_LOCK:
+            self._ALL_DRIVERS.append(driver)
+        return driver
+    
+    def _pool(self) -> queue.Queue:
+        with self._POOL_LOCK:
+            return self._DRIVER_POOLS.setdefault(self.headless, queue.Queue())
+    
+    def init_driver(self):
+        """Initialize Selenium WebDriver (reusing a warm one when available)."""
+        self.driver = self._acquire_driver()
     
     def close_driver(self):
-        """Close the WebDriver."""
+        """Return the WebDriver to the shared pool (or quit it if it died); browsers are quit at process exit."""
         if self.driver:
-            self.driver.quit()
+            try:
+                self.driver.title
+                self._release_driver(self.driver)
+            except Exception:
+                self._discard_driver(self.driver)
             self.driver = None
     
+    @classmethod
+    def shutdown_drivers(cls):
+        """Quit every browser started by this process."""
+        with cls._POOL_LOCK:
+            drivers, cls._ALL_DRIVERS = cls._ALL_DRIVERS, []
+            cls._DRIVER_POOLS.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    
+    def _discard_driver(self, driver):
+        """Quit a broken driver and forget it instead of pooling it."""
+        with self._POOL_LOCK:
+            if driver in self._ALL_DRIVERS:
+                self._ALL_DRIVERS.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def _acquire_driver(self):
+        """Take a live warm driver from the pool, creating one if none is idle."""
+        while True:
+            try:
+                driver = self._pool().get_nowait()
+            except queue.Empty:
+                driver = self._new_driver()
+                break
+            try:
+                # Cheap round-trip; fails if the window was closed or Chrome died
+                driver.title
+                break
+            except Exception:
+                print("⚠️ Discarding dead pooled browser")
+                self._discard_driver(driver)
+        return driver
+    
+    def _seed_linkedin_cookies(self, driver):
+        """Share this session's LinkedIn login with a worker; cookies need a page on the domain first."""
+        driver.get("https://www.linkedin.com")
+        for cookie in self._linkedin_cookies:
+            driver.add_cookie(cookie)
+    
+    def _release_driver(self, driver):
+        """Wipe every cookie, then return the driver to the process-wide pool (if not full)."""
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            driver.delete_all_cookies()
+        pool = self._pool()
+        with self._POOL_LOCK:
+            if pool.qsize() < self.max_workers:
+                pool.put(driver)
+                return
+        self._discard_driver(driver)
+    
+    def _drain_pool(self):
+        """Quit every idle driver in this instance's pool."""
+        pool = self._pool()
+        while True:
+            try:
+                driver = pool.get_nowait()
+            except queue.Empty:
+                return
+            self._discard_driver(driver)
+    
+    @staticmethod
+    def _wait_for_page(driver, timeout: int = 10):
+        """Block until the document has loaded instead of sleeping a fixed time."""
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            pass
+    
     def login_linkedin(self, email: str, password: str) -> bool:
         """Login to LinkedIn."""
         try:
             self.driver.get("https://www.linkedin.com/login")
-            time.sleep(2)
+            self._wait_for_page(self.driver)
             
             email_field = self.driver.find_element(By.ID, "username")
             password_field = self.driver.find_element(By.ID, "password")
@@ -58,7 +185,10 @@ class JobApplicationService:
             login_btn = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
             login_btn.click()
             
-            time.sleep(5)
+            try:
+                WebDriverWait(self.driver, 10).until(lambda d: "login" not in d.current_url)
+            except TimeoutException:
+                pass
             
             # Check if login successful
             if "feed" in self.driver.current_url or "mynetwork" in self.driver.current_url:
@@ -72,17 +202,42 @@ class JobApplicationService:
             print(f"❌ LinkedIn login error: {e}")
             return False
     
-    def apply_linkedin_easy_apply(self, job_url: str, user_data: dict) -> bool:
+    @staticmethod
+    def _credential_key(email: str, password: str) -> str:
+        return hashlib.sha256(f"{email}\0{password}".encode("utf-8")).hexdigest()
+    
+    def restore_linkedin_session(self, credential_key: str) -> bool:
+        """Reuse cookies from an earlier login with the same credentials instead of logging in again."""
+        cookies = self._linkedin_sessions.get(credential_key)
+        if not cookies:
+            return False
+        try:
+            self.driver.get("https://www.linkedin.com")
+            for cookie in cookies:
+                self.driver.add_cookie(cookie)
+            self.driver.get("https://www.linkedin.com/feed/")
+            self._wait_for_page(self.driver)
+            if "login" in self.driver.current_url or "authwall" in self.driver.current_url:
+                self._linkedin_sessions.pop(credential_key, None)
+                return False
+            print("✅ Reused LinkedIn session")
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not reuse LinkedIn session: {e}")
+            return False
+    
+    def apply_linkedin_easy_apply(self, job_url: str, user_data: dict, driver=None) -> bool:
         """
         Apply to a LinkedIn job using Easy Apply.
         Handles multi-step forms.
         """
+        driver = driver or self.driver
         try:
-            self.driver.get(job_url)
-            time.sleep(3)
+            driver.get(job_url)
+            self._wait_for_page(driver)
             
             # Click Easy Apply button
-            easy_apply_btn = WebDriverWait(self.driver, 10).until(
+            easy_apply_btn = WebDriverWait(driver, 10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label*='Easy Apply']"))
             )
             easy_apply_btn.click()
@@ -98,7 +253,7 @@ class JobApplicationService:
                 # Fill in form fields
                 try:
                     # Phone number
-                    phone_input = self.driver.find_element(By.CSS_SELECTOR, "input[id*='phoneNumber']")
+                    phone_input = driver.find_element(By.CSS_SELECTOR, "input[id*='phoneNumber']")
                     if phone_input.get_attribute("value") == "":
                         phone_input.send_keys(user_data.get("contact", {}).get("phone", ""))
                 except NoSuchElementException:
@@ -106,13 +261,13 @@ class JobApplicationService:
                 
                 # Check for Next or Submit button
                 try:
-                    next_btn = self.driver.find_element(By.CSS_SELECTOR, "button[aria-label='Continue to next step']")
+                    next_btn = driver.find_element(By.CSS_SELECTOR, "button[aria-label='Continue to next step']")
                     next_btn.click()
                     time.sleep(2)
                 except NoSuchElementException:
                     # Try to find Submit button
                     try:
-                        submit_btn = self.driver.find_element(By.CSS_SELECTOR, "button[aria-label='Submit application']")
+                        submit_btn = driver.find_element(By.CSS_SELECTOR, "button[aria-label='Submit application']")
                         submit_btn.click()
                         time.sleep(3)
                         print("✅ Application submitted!")
@@ -120,7 +275,7 @@ class JobApplicationService:
                     except NoSuchElementException:
                         # Try generic submit
                         try:
-                            submit_btn = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
+                            submit_btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
                             submit_btn.click()
                             time.sleep(3)
                             return True
@@ -134,54 +289,140 @@ class JobApplicationService:
             print(f"❌ LinkedIn Easy Apply error: {e}")
             return False
     
-    def apply_generic_form(self, job_url: str, user_data: dict) -> bool:
+    def _prefetch_form_schema(self, url: str):
+        """
+        Fetch the page over plain HTTP and describe its application <form>:
+        the first one asking for an email plus another contact detail, which
+        skips search and newsletter forms. Returns None when there is no such
+        static form (e.g. rendered by JS).
+        """
+        try:
+            resp = _HTTP.get(url)
+            resp.raise_for_status()
+        except httpx.HTTPError:
+            return None
+        
+        for form in HTMLParser(resp.text).css("form"):
+            fields = [
+                {
+                    "name": node.attributes.get("name") or "",
+                    "id": node.attributes.get("id") or "",
+                    "type": (node.attributes.get("type") or "text").lower(),
+                    "value": node.attributes.get("value") or "",
+                    "required": "required" in node.attributes,
+                }
+                for node in form.css("input")
+            ]
+            matched = {self._match_field(f) for f in fields if f["name"]} - {None}
+            if "email" not in matched or len(matched) < 2:
+                continue
+            
+            return {
+                "action": urljoin(str(resp.url), form.attributes.get("action") or ""),
+                "method": (form.attributes.get("method") or "get").lower(),
+                "fields": fields,
+                "requires_file": any(f["type"] == "file" and f["required"] for f in fields),
+            }
+        return None
+    
+    @staticmethod
+    def _match_field(field: dict):
+        """Map an input's name/id/type to the user-data key it should receive."""
+        name = (field.get("name") or "").lower()
+        ident = (field.get("id") or "").lower()
+        ftype = (field.get("type") or "").lower()
+        if ftype == "email" or "email" in name:
+            return "email"
+        if ftype == "tel" or "phone" in name:
+            return "phone"
+        if "linkedin" in name:
+            return "linkedin"
+        if "name" in name or "name" in ident:
+            return "name"
+        return None
+    
+    def _submit_form_direct(self, schema: dict, user_data: dict) -> bool:
+        """
+        Submit a static form with a single HTTP POST instead of driving Chrome.
+        Only for POST forms without required uploads, filled with at least an
+        email and one other contact value.
+        """
+        if schema["method"] != "post" or schema["requires_file"]:
+            return False
+        contact = user_data.get("contact", {})
+        values = {
+            "name": user_data.get("name", ""),
+            "email": contact.get("email", ""),
+            "phone": contact.get("phone", ""),
+            "linkedin": contact.get("linkedin", ""),
+        }
+        
+        payload = {}
+        filled = set()
+        for field in schema["fields"]:
+            if not field["name"] or field["type"] in ("submit", "button", "file"):
+                continue
+            key = self._match_field(field)
+            if key:
+                payload[field["name"]] = values[key]
+                if values[key]:
+                    filled.add(key)
+            elif field["type"] == "hidden":
+                # Keep CSRF tokens and similar hidden values
+                payload[field["name"]] = field["value"]
+        
+        if "email" not in filled or len(filled) < 2:
+            return False
+        
+        try:
+            resp = _HTTP.post(schema["action"], data=payload)
+            return resp.status_code < 400
+        except httpx.HTTPError:
+            return False
+    
+    def apply_generic_form(self, job_url: str, user_data: dict, driver=None) -> bool:
         """
-        Apply to jobs via generic application forms.
+        Apply to jobs via generic application forms in the browser.
         Attempts to fill common fields.
         """
+        driver = driver or self.driver
         try:
-            self.driver.get(job_url)
-            time.sleep(3)
+            driver.get(job_url)
+            self._wait_for_page(driver)
             
             # Try to find and fill common form fields
             contact = user_data.get("contact", {})
+            values = {
+                "name": user_data.get("name", ""),
+                "email": contact.get("email", ""),
+                "phone": contact.get("phone", ""),
+                "linkedin": contact.get("linkedin", ""),
+            }
             
-            # Name
-            try:
-                name_field = self.driver.find_element(By.CSS_SELECTOR, "input[name*='name'], input[id*='name']")
-                name_field.send_keys(user_data.get("name", ""))
-            except NoSuchElementException:
-                pass
-            
-            # Email
-            try:
-                email_field = self.driver.find_element(By.CSS_SELECTOR, "input[type='email'], input[name*='email']")
-                email_field.send_keys(contact.get("email", ""))
-            except NoSuchElementException:
-                pass
-            
-            # Phone
-            try:
-                phone_field = self.driver.find_element(By.CSS_SELECTOR, "input[type='tel'], input[name*='phone']")
-                phone_field.send_keys(contact.get("phone", ""))
-            except NoSuchElementException:
-                pass
+            # Fetch every input and its attributes in two round-trips, then match in Python
+            inputs = driver.find_elements(By.CSS_SELECTOR, "input[name], input[id]")
+            attrs = driver.execute_script(
+                "return arguments[0].map(e => ({name: e.name || '', id: e.id || '', type: (e.type || '').toLowerCase()}));",
+                inputs,
+            ) if inputs else []
             
-            # LinkedIn URL
-            try:
-                linkedin_field = self.driver.find_element(By.CSS_SELECTOR, "input[name*='linkedin']")
-                linkedin_field.send_keys(contact.get("linkedin", ""))
-            except NoSuchElementException:
-                pass
+            filled = set()
+            for element, field in zip(inputs, attrs):
+                key = self._match_field(field)
+                if key and key not in filled:
+                    element.send_keys(values[key])
+                    filled.add(key)
             
             # Try to find and click submit button
             try:
-                submit_btn = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit'], input[type='submit']")
+                submit_btn = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit'], input[type='submit']"))
+                )
                 submit_btn.click()
                 time.sleep(3)
                 print("✅ Generic form submitted!")
                 return True
-            except NoSuchElementException:
+            except TimeoutException:
                 print("⚠️ Could not find submit button")
                 return False
         
@@ -189,82 +430,151 @@ class JobApplicationService:
             print(f"❌ Generic form error: {e}")
             return False
     
+    def _apply_one_job(self, job: Dict, user_data: dict, linkedin_logged_in: bool) -> Dict:
+        """Apply to a single job on a pooled driver and return its result record."""
+        job_url = job.get("apply_link", "")
+        result = {
+            "job_title": job.get("title", ""),
+            "company": job.get("company", ""),
+            "url": job_url,
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "failed"
+        }
+        
+        use_linkedin = "linkedin.com" in job_url and linkedin_logged_in
+        if not use_linkedin:
+            # Static forms are posted over plain HTTP; Chrome is only started when that can't work
+            schema = self._prefetch_form_schema(job_url)
+            if schema and schema["requires_file"]:
+                result["status"] = "partial"
+                result["error"] = "Form requires a file upload; not submitted"
+                print(f"⚠️ Not submitted (file upload required): {job.get('title')} at {job.get('company')}")
+                return result
+            if schema and self._submit_form_direct(schema, user_data):
+                result["status"] = "success"
+                print(f"✅ Applied to: {job.get('title')} at {job.get('company')} (direct POST)")
+                return result
+        
+        driver = base_handle = None
+        try:
+            driver = self._acquire_driver()
+            base_handle = driver.current_window_handle
+            driver.switch_to.new_window("tab")
+            
+            # Determine application method
+            if use_linkedin:
+                self._seed_linkedin_cookies(driver)
+                success = self.apply_linkedin_easy_apply(job_url, user_data, driver)
+            else:
+                success = self.apply_generic_form(job_url, user_data, driver)
+            
+            if success:
+                result["status"] = "success"
+                print(f"✅ Applied to: {job.get('title')} at {job.get('company')}")
+            else:
+                result["status"] = "partial"
+                print(f"⚠️ Partial/failed: {job.get('title')} at {job.get('company')}")
+        
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+            print(f"❌ Error applying to {job.get('title')}: {e}")
+        finally:
+            # Close only this job's tab; the browser stays warm for the next job
+            if driver is not None:
+                try:
+                    if driver.current_window_handle != base_handle:
+                        driver.close()
+                        driver.switch_to.window(base_handle)
+                    self._release_driver(driver)
+                except Exception as e:
+                    print(f"⚠️ Dropping broken browser: {e}")
+                    self._discard_driver(driver)
+        
+        return result
+    
+    def _apply_paced(self, job: Dict, user_data: dict, linkedin_logged_in: bool) -> Dict:
+        """_apply_one_job followed by the per-job delay; LinkedIn jobs are also serialized."""
+        use_linkedin = "linkedin.com" in job.get("apply_link", "") and linkedin_logged_in
+        with self._linkedin_lock if use_linkedin else contextlib.nullcontext():
+            result = self._apply_one_job(job, user_data, linkedin_logged_in)
+            time.sleep(APPLY_DELAY)  # Rate limiting
+        return result
+    
     def apply_to_jobs(self, jobs: List[Dict], user_data: dict, linkedin_email: str = None, linkedin_password: str = None, max_applications: int = 5) -> List[Dict]:
         """
         Main method to apply to multiple jobs.
+        Jobs are applied to in parallel waves, one browser per worker, until
+        `max_applications` succeed or the list runs out. Each worker keeps the
+        old per-job delay, and LinkedIn jobs are applied to one at a time.
         Returns list of application results.
         """
         results = []
-        self.init_driver()
         
-        # Login to LinkedIn if credentials provided
+        # Login to LinkedIn if credentials provided; otherwise no browser is needed up front
         linkedin_logged_in = False
         if linkedin_email and linkedin_password:
-            linkedin_logged_in = self.login_linkedin(linkedin_email, linkedin_password)
+            credential_key = self._credential_key(linkedin_email, linkedin_password)
+            try:
+                self.init_driver()
+                # Login (and its security checks) is paid once per session, not per batch
+                linkedin_logged_in = (
+                    self.restore_linkedin_session(credential_key)
+                    or self.login_linkedin(linkedin_email, linkedin_password)
+                )
+                if linkedin_logged_in:
+                    self._linkedin_cookies = self.driver.get_cookies()
+                    self._linkedin_sessions[credential_key] = self._linkedin_cookies
+            except Exception as e:
+                print(f"❌ LinkedIn login error: {e}")
+            finally:
+                # The login driver becomes the first pooled worker (cookies wiped)
+                self.close_driver()
         
+        pending = [job for job in jobs if job.get("apply_link")]
         applied_count = 0
         
-        for job in jobs:
-            if applied_count >= max_applications:
-                break
-            
-            job_url = job.get("apply_link", "")
-            if not job_url:
-                continue
-            
-            result = {
-                "job_title": job.get("title", ""),
-                "company": job.get("company", ""),
-                "url": job_url,
-                "timestamp": datetime.utcnow().isoformat(),
-                "status": "failed"
-            }
-            
-            try:
-                # Determine application method
-                if "linkedin.com" in job_url and linkedin_logged_in:
-                    success = self.apply_linkedin_easy_apply(job_url, user_data)
-                else:
-                    success = self.apply_generic_form(job_url, user_data)
-                
-                if success:
-                    result["status"] = "success"
-                    applied_count += 1
-                    print(f"✅ Applied to: {job.get('title')} at {job.get('company')}")
-                else:
-                    result["status"] = "partial"
-                    print(f"⚠️ Partial/failed: {job.get('title')} at {job.get('company')}")
-            
-            except Exception as e:
-                result["status"] = "error"
-                result["error"] = str(e)
-                print(f"❌ Error applying to {job.get('title')}: {e}")
-            
-            results.append(result)
-            time.sleep(5)  # Rate limiting
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending and applied_count < max_applications:
+                wave, pending = pending[:max_applications - applied_count], pending[max_applications - applied_count:]
+                for result in executor.map(lambda job: self._apply_paced(job, user_data, linkedin_logged_in), wave):
+                    results.append(result)
+                    if result["status"] == "success":
+                        applied_count += 1
         
-        self.close_driver()
+        self._linkedin_cookies = []
+        if not self.headless:
+            # Visible Chrome windows shouldn't stay open between batches
+            self._drain_pool()
         
         # Save application log
         self.save_application_log(results)
         
         return results
     
+    def _migrate_legacy_log(self):
+        """One-time conversion of the old whole-file JSON log to JSONL."""
+        if not os.path.exists(self.legacy_log_path) or os.path.exists(self.applications_log_path):
+            return
+        try:
+            with open(self.legacy_log_path, "rb") as f:
+                legacy = orjson.loads(f.read()).get("applications", [])
+        except (orjson.JSONDecodeError, OSError, AttributeError) as e:
+            # Don't let a damaged old log break the service; keep it aside for inspection
+            print(f"⚠️ Unreadable legacy application log, moved aside: {e}")
+            try:
+                os.replace(self.legacy_log_path, self.legacy_log_path + ".corrupt")
+            except OSError:
+                pass
+            return
+        self.save_application_log(legacy)
+        os.replace(self.legacy_log_path, self.legacy_log_path + ".migrated")
+    
     def save_application_log(self, results: List[Dict]):
-        """Save application results to log file."""
-        # Load existing log
-        if os.path.exists(self.applications_log_path):
-            with open(self.applications_log_path, "r", encoding="utf-8") as f:
-                log_data = json.load(f)
-        else:
-            log_data = {"applications": []}
-        
-        # Append new results
-        log_data["applications"].extend(results)
-        
-        # Save
-        with open(self.applications_log_path, "w", encoding="utf-8") as f:
-            json.dump(log_data, f, ensure_ascii=False, indent=2)
+        """Append application results to the JSONL log, one record per line."""
+        with open(self.applications_log_path, "ab", buffering=1 << 18) as f:
+            for r in results:
+                f.write(orjson.dumps(r) + b"\n")
         
         print(f"Application log saved to {self.applications_log_path}")
     
@@ -273,7 +583,8 @@ class JobApplicationService:
         if not os.path.exists(self.applications_log_path):
             return []
         
-        with open(self.applications_log_path, "r", encoding="utf-8") as f:
-            log_data = json.load(f)
-        
-        return log_data.get("applications", [])
\ No newline at end of file
+        with open(self.applications_log_path, "rb") as f:
+            return [orjson.loads(line) for line in f if line.strip()]
+
+
+atexit.register(JobApplicationService.shutdown_drivers)
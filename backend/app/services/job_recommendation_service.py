@@ -1,17 +1,69 @@
 import os
+import re
+import time
 import json
+import orjson
+import logging
+import asyncio
+import functools
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from backend.app.utils.file_io import write_json_atomic
+from rapidfuzz import process, fuzz, utils
+from sklearn.feature_extraction.text import TfidfVectorizer
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Free keys
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
 ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID")
 ADZUNA_API_KEY = os.getenv("ADZUNA_API_KEY")
 
+JSEARCH_URL = "https://jsearch.p.rapidapi.com/search"
+REMOTEOK_URL = "https://remoteok.com/api"
+ADZUNA_URL = "https://api.adzuna.com/v1/api/jobs/in/search/1"
+FETCH_TIMEOUT = 8
+REMOTEOK_TTL = 300  # seconds; the feed is ~1 MB and identical for every title
+
+# Fallback fan-out for callers already inside an event loop (asyncio.run can't nest)
+_FETCH_POOL = ThreadPoolExecutor(max_workers=9, thread_name_prefix="job-fetch")
+
+# Parsed RemoteOK feed as [(title_lower, job), ...], shared across titles and reruns
+_REMOTEOK_CACHE = {"time": 0.0, "index": None}
+TFIDF_WEIGHT = 50  # cosine in [0, 1] scaled to sit alongside the 10/15 keyword points
+SKILL_MATCH_CUTOFF = 85
+TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.#-]{2,}")
+# Experience bullets -> candidate skill words (4+ chars, punctuation stripped)
+SKILL_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.#-]{3,}")
+STOPWORDS = frozenset({
+    "with", "from", "that", "this", "into", "using", "used", "over", "than", "their",
+    "which", "while", "across", "within", "through", "based", "such", "also", "more",
+    "developed", "implemented", "built", "designed", "created", "worked", "improved",
+})
+SHORT_SKILL_LEN = 4  # "ml", "c++", "java", "rust": fuzzy scores on these are noise (rust ~ trust), so exact only
+SINGLE_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#-]*")  # skills the fuzzy fallback may compare to one job token
+HTTP_HEADERS = {"User-Agent": "job-recommender/1.0", "Accept-Encoding": "gzip"}
+
+# Keep-alive session shared by the synchronous fetchers: one TLS handshake per host
+_SESSION = requests.Session()
+_SESSION.headers.update(HTTP_HEADERS)
+_adapter = HTTPAdapter(pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+def _word_alternation(words) -> re.Pattern:
+    """Whole-phrase alternation; lookarounds instead of \\b so skills like 'c++' still match."""
+    words = sorted(set(words), key=len, reverse=True)
+    return re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, words)) + r")(?!\w)", re.I)
+
 class JobRecommendationService:
     """
     Fully free job recommender using:
@@ -28,6 +80,12 @@ class JobRecommendationService:
     # Extract full user profile from your resume data
     # -------------------------------------------------------
     def extract_user_profile(self, user_data: dict) -> dict:
+        # Memoized on the canonical JSON of user_data; unchanged resumes skip re-extraction
+        key = json.dumps(user_data, sort_keys=True, default=str)
+        return {k: list(v) if isinstance(v, tuple) else v for k, v in _extract_profile_cached(key)}
+
+    @staticmethod
+    def _build_user_profile(user_data: dict) -> dict:
         profile = {
             "skills": [],
             "experience_years": 0,
@@ -50,16 +108,18 @@ class JobRecommendationService:
         for p in user_data.get("projects", []):
             skills += p.get("technologies", [])
 
-        # Extract words from experience bullet points
+        # Normalize skills
+        skills_set = {s.lower() for s in skills if isinstance(s, str)}
+
+        # Extract words from experience bullet points, deduplicating as we go
         for exp in user_data.get("experience", []):
             for item in exp.get("items", []):
-                for word in item.split():
-                    if len(word) > 3:
-                        skills.append(word)
+                skills_set.update(
+                    t for t in (w.lower().rstrip(".") for w in SKILL_TOKEN_RE.findall(item))
+                    if t not in STOPWORDS
+                )
 
-        # Normalize skills
-        skills = [s.lower() for s in skills if isinstance(s, str)]
-        profile["skills"] = list(set(skills))
+        profile["skills"] = list(skills_set)
 
         # -------------------------------------------------------
         # Experience years
@@ -98,34 +158,52 @@ class JobRecommendationService:
     # -------------------------------------------------------
     # FREE API 1 — JSearch (RapidAPI free plan)
     # -------------------------------------------------------
-    def search_jobs_jsearch(self, query: str, limit: int = 15) -> List[Dict]:
-        if not RAPIDAPI_KEY:
-            print("⚠️ RAPIDAPI_KEY missing, skipping JSearch")
-            return []
-
-        url = "https://jsearch.p.rapidapi.com/search"
+    @staticmethod
+    def _jsearch_request(query: str):
         headers = {
             "X-RapidAPI-Key": RAPIDAPI_KEY,
             "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
         }
-        params = {"query": query, "page": 1}
+        return headers, {"query": query, "page": 1}
+
+    @staticmethod
+    def _parse_jsearch(data: dict) -> List[Dict]:
+        jobs = []
+        for job in data.get("data", []):
+            jobs.append({
+                "title": job.get("job_title", ""),
+                "company": job.get("employer_name", ""),
+                "location": job.get("job_city", "") or job.get("job_country", ""),
+                "description": job.get("job_description", ""),
+                "apply_link": job.get("job_apply_link", ""),
+                "posted_date": job.get("job_posted_at_datetime_utc", ""),
+                "source": "JSearch"
+            })
+        return jobs
 
+    def search_jobs_jsearch(self, query: str, limit: int = 15) -> List[Dict]:
+        if not RAPIDAPI_KEY:
+            print("⚠️ RAPIDAPI_KEY missing, skipping JSearch")
+            return []
+
+        headers, params = self._jsearch_request(query)
         try:
-            r = requests.get(url, headers=headers, params=params, timeout=8)
-            data = r.json()
+            r = _SESSION.get(JSEARCH_URL, headers=headers, params=params, timeout=FETCH_TIMEOUT)
+            return self._parse_jsearch(orjson.loads(r.content))
 
-            jobs = []
-            for job in data.get("data", []):
-                jobs.append({
-                    "title": job.get("job_title", ""),
-                    "company": job.get("employer_name", ""),
-                    "location": job.get("job_city", "") or job.get("job_country", ""),
-                    "description": job.get("job_description", ""),
-                    "apply_link": job.get("job_apply_link", ""),
-                    "posted_date": job.get("job_posted_at_datetime_utc", ""),
-                    "source": "JSearch"
-                })
-            return jobs
+        except Exception as e:
+            print("JSearch error:", e)
+            return []
+
+    async def _jsearch(self, session: aiohttp.ClientSession, query: str) -> List[Dict]:
+        if not RAPIDAPI_KEY:
+            print("⚠️ RAPIDAPI_KEY missing, skipping JSearch")
+            return []
+
+        headers, params = self._jsearch_request(query)
+        try:
+            async with session.get(JSEARCH_URL, headers=headers, params=params) as r:
+                return self._parse_jsearch(orjson.loads(await r.read()))
 
         except Exception as e:
             print("JSearch error:", e)
@@ -134,151 +212,255 @@ class JobRecommendationService:
     # -------------------------------------------------------
     # FREE API 2 — RemoteOK (no key, free + safe)
     # -------------------------------------------------------
+    @staticmethod
+    def _cached_remoteok_index():
+        if time.time() - _REMOTEOK_CACHE["time"] < REMOTEOK_TTL:
+            return _REMOTEOK_CACHE["index"]
+        return None
+
+    @staticmethod
+    def _store_remoteok_index(jobs_data: list) -> list:
+        index = [
+            (job.get("position", "").lower(), job)
+            for job in jobs_data[1:]  # First entry is metadata
+        ]
+        _REMOTEOK_CACHE.update(time=time.time(), index=index)
+        return index
+
+    @staticmethod
+    def _parse_remoteok(index: list, keywords: str) -> List[Dict]:
+        keywords = keywords.lower()
+        jobs = []
+        for title_lower, job in index:
+            if keywords in title_lower:
+                jobs.append({
+                    "title": job.get("position", ""),
+                    "company": job.get("company", ""),
+                    "location": job.get("location", "Remote"),
+                    "description": job.get("description", ""),
+                    "apply_link": job.get("url", ""),
+                    "posted_date": job.get("date", ""),
+                    "source": "RemoteOK"
+                })
+        return jobs
+
     def search_jobs_remoteok(self, keywords: str) -> List[Dict]:
         try:
-            r = requests.get("https://remoteok.com/api", timeout=8)
-            jobs_data = r.json()
-
-            jobs = []
-            for job in jobs_data[1:]:  # First entry is metadata
-                title = job.get("position", "")
-
-                if keywords.lower() in title.lower():
-                    jobs.append({
-                        "title": title,
-                        "company": job.get("company", ""),
-                        "location": job.get("location", "Remote"),
-                        "description": job.get("description", ""),
-                        "apply_link": job.get("url", ""),
-                        "posted_date": job.get("date", ""),
-                        "source": "RemoteOK"
-                    })
-            return jobs
+            index = self._cached_remoteok_index()
+            if index is None:
+                r = _SESSION.get(REMOTEOK_URL, timeout=FETCH_TIMEOUT)
+                index = self._store_remoteok_index(orjson.loads(r.content))
+            return self._parse_remoteok(index, keywords)
         
         except Exception as e:
             print("RemoteOK error:", e)
             return []
 
+    async def _remoteok(self, session: aiohttp.ClientSession, titles: List[str]) -> List[Dict]:
+        """One feed fetch (or cache hit) filtered for every title."""
+        try:
+            index = self._cached_remoteok_index()
+            if index is None:
+                async with session.get(REMOTEOK_URL) as r:
+                    index = self._store_remoteok_index(orjson.loads(await r.read()))
+            return [job for t in titles for job in self._parse_remoteok(index, t)]
+
+        except Exception as e:
+            print("RemoteOK error:", e)
+            return []
+
     # -------------------------------------------------------
     # FREE API 3 — Adzuna (optional)
     # -------------------------------------------------------
-    def search_jobs_adzuna(self, keywords: str) -> List[Dict]:
-        if not ADZUNA_APP_ID or not ADZUNA_API_KEY:
-            return []
-
-        url = f"https://api.adzuna.com/v1/api/jobs/in/search/1"
-        params = {
+    @staticmethod
+    def _adzuna_params(keywords: str) -> dict:
+        return {
             "app_id": ADZUNA_APP_ID,
             "app_key": ADZUNA_API_KEY,
             "what": keywords,
             "content-type": "application/json"
         }
 
+    @staticmethod
+    def _parse_adzuna(data: dict) -> List[Dict]:
+        jobs = []
+        for job in data.get("results", []):
+            jobs.append({
+                "title": job.get("title", ""),
+                "company": job.get("company", {}).get("display_name", ""),
+                "location": job.get("location", {}).get("display_name", ""),
+                "description": job.get("description", ""),
+                "apply_link": job.get("redirect_url", ""),
+                "posted_date": job.get("created", ""),
+                "source": "Adzuna"
+            })
+        return jobs
+
+    def search_jobs_adzuna(self, keywords: str) -> List[Dict]:
+        if not ADZUNA_APP_ID or not ADZUNA_API_KEY:
+            return []
+
         try:
-            r = requests.get(url, params=params, timeout=8)
-            data = r.json()
+            r = _SESSION.get(ADZUNA_URL, params=self._adzuna_params(keywords), timeout=FETCH_TIMEOUT)
+            return self._parse_adzuna(orjson.loads(r.content))
 
-            jobs = []
-            for job in data.get("results", []):
-                jobs.append({
-                    "title": job.get("title", ""),
-                    "company": job.get("company", {}).get("display_name", ""),
-                    "location": job.get("location", {}).get("display_name", ""),
-                    "description": job.get("description", ""),
-                    "apply_link": job.get("redirect_url", ""),
-                    "posted_date": job.get("created", ""),
-                    "source": "Adzuna"
-                })
-            return jobs
+        except Exception as e:
+            print("Adzuna error:", e)
+            return []
+
+    async def _adzuna(self, session: aiohttp.ClientSession, keywords: str) -> List[Dict]:
+        if not ADZUNA_APP_ID or not ADZUNA_API_KEY:
+            return []
+
+        try:
+            async with session.get(ADZUNA_URL, params=self._adzuna_params(keywords)) as r:
+                return self._parse_adzuna(orjson.loads(await r.read()))
 
         except Exception as e:
             print("Adzuna error:", e)
             return []
 
+    # -------------------------------------------------------
+    # Concurrent fetch across all sources and titles
+    # -------------------------------------------------------
+    async def _fetch_all_jobs(self, titles: List[str]) -> List[Dict]:
+        timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout, headers=HTTP_HEADERS) as session:
+            tasks = (
+                [self._jsearch(session, t) for t in titles]
+                + [self._remoteok(session, titles)]
+                + [self._adzuna(session, t) for t in titles]
+            )
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        return self._merge_results(results)
+
+    def _fetch_all_jobs_threaded(self, titles: List[str]) -> List[Dict]:
+        """Same fan-out on the shared thread pool with the pooled requests.Session."""
+        futures = (
+            [_FETCH_POOL.submit(self.search_jobs_jsearch, t) for t in titles]
+            # One task for all titles: the first call fills the feed cache for the rest
+            + [_FETCH_POOL.submit(lambda: [j for t in titles for j in self.search_jobs_remoteok(t)])]
+            + [_FETCH_POOL.submit(self.search_jobs_adzuna, t) for t in titles]
+        )
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return self._merge_results(results)
+
+    @staticmethod
+    def _merge_results(results: list) -> List[Dict]:
+        all_jobs = []
+        for result in results:
+            if isinstance(result, Exception):
+                print("Job fetch error:", result)
+                continue
+            for job in result:
+                job["_key"] = (job["title"].lower(), job["company"].lower())
+            all_jobs += result
+        return all_jobs
+
     # -------------------------------------------------------
     # Ranking — the FIX that makes scores non-zero
     # -------------------------------------------------------
     def rank_jobs_by_relevance(self, jobs: List[Dict], profile: dict) -> List[Dict]:
-        user_skills = set(profile.get("skills", []))
-        job_titles = profile.get("job_titles", [])
-
-        # fuzzy synonyms
-        synonyms = {
-            "python": ["python", "pandas", "numpy", "fastapi", "flask"],
-            "docker": ["docker", "container", "kubernetes", "k8s"],
-            "machine learning": ["ml", "machine learning", "deep learning", "neural"],
-            "ai": ["ai", "llm", "rag", "gpt", "bert"],
-            "nlp": ["nlp", "transformer", "token"],
-            "cloud": ["aws", "azure", "gcp", "cloud"],
-            "database": ["postgres", "mysql", "mongodb", "sql"]
-        }
-
-        for job in jobs:
-            score = 0
+        user_skills = frozenset(profile.get("skills", []))
+        job_titles_lower = [t.lower() for t in profile.get("job_titles", [])]
+
+        skills = [s for s in user_skills if s.strip()]
+        # Every skill gets an exact whole-phrase match ("machine learning", "ci/cd", "react" in
+        # "react.js"); only longer single-token skills fall back to fuzzy matching
+        skill_pattern = _word_alternation(skills) if skills else None
+        fuzzy_skills = [s for s in skills if len(s) > SHORT_SKILL_LEN and SINGLE_TOKEN_RE.fullmatch(s)]
+        tfidf_scores = self._tfidf_scores(jobs, skills + job_titles_lower)
+
+        for i, job in enumerate(jobs):
+            score = round(TFIDF_WEIGHT * tfidf_scores[i])
             text = (job.get("title", "") + " " + job.get("description", "")).lower()
 
             # ----------------------------------------
-            # 1. Exact match
-            # ----------------------------------------
-            exact_matches = [s for s in user_skills if s in text]
-            score += len(exact_matches) * 10
-
-            # ----------------------------------------
-            # 2. Fuzzy match (synonyms)
+            # 1. Exact skill match, then fuzzy (skills × job tokens) for the rest
             # ----------------------------------------
-            fuzzy_matches = []
-            for key, words in synonyms.items():
-                for w in words:
-                    if w in text:
-                        fuzzy_matches.append(key)
-                        score += 5
-                        break
+            matched = set(skill_pattern.findall(text)) if skill_pattern else set()
+            score += len(matched) * 10
+            unmatched = [s for s in fuzzy_skills if s not in matched]
+            tokens = TOKEN_RE.findall(text) if unmatched else []
+            if tokens:
+                mat = process.cdist(
+                    unmatched, tokens,
+                    # Plain ratio: WRatio's partial scaling lets "java" match "javascript"
+                    scorer=fuzz.ratio, processor=utils.default_process,
+                    score_cutoff=SKILL_MATCH_CUTOFF,
+                )
+                best = mat.max(axis=1)
+                matched.update(unmatched[j] for j in best.nonzero()[0])
+                # A perfect match is worth the old 10 points; near-misses slightly less
+                score += round(float(best.sum()) / 10)
 
             # ----------------------------------------
-            # 3. Job title relevance
+            # 2. Job title relevance
             # ----------------------------------------
-            for title in job_titles:
-                if title.lower() in job.get("title", "").lower():
+            job_title = job.get("title", "").lower()
+            for title in job_titles_lower:
+                if title in job_title:
                     score += 15
 
             # ----------------------------------------
             # Save final score
             # ----------------------------------------
-            job["matched_skills"] = list(set(exact_matches + fuzzy_matches))
+            job["matched_skills"] = list(matched)
             job["relevance_score"] = score
-            print("\n--- JOB DEBUG ---")
-            print("TITLE:", job.get("title"))
-            print("DESC:", job.get("description")[:300])    # first 300 chars
-            print("SKILLS:", user_skills)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("TITLE: %s", job.get("title"))
+                logger.debug("DESC: %s", (job.get("description") or "")[:300])    # first 300 chars
+                logger.debug("SKILLS: %s", user_skills)
         return sorted(jobs, key=lambda x: x["relevance_score"], reverse=True)
 
+    @staticmethod
+    def _tfidf_scores(jobs: List[Dict], profile_terms: List[str]) -> List[float]:
+        """Cosine of each job against the profile, as one sparse mat-vec product."""
+        if not jobs or not profile_terms:
+            return [0.0] * len(jobs)
+        corpus = [job.get("title", "") + " " + (job.get("description") or "") for job in jobs]
+        profile_text = " ".join(profile_terms)
+        try:
+            # Fitted per call: the corpus is only this run's jobs, so it is cheap, and a
+            # frozen vocabulary would zero out every term it hadn't seen
+            vectorizer = TfidfVectorizer(ngram_range=(1, 2), lowercase=True, stop_words="english")
+            matrix = vectorizer.fit_transform(corpus + [profile_text])
+        except ValueError:
+            # Every term was a stop word; nothing to compare
+            return [0.0] * len(jobs)
+        # Rows are L2-normalized, so the dot product is the cosine
+        return (matrix[:-1] @ matrix[-1].T).toarray().ravel().tolist()
+
     # -------------------------------------------------------
     # MAIN: Get recommended jobs
     # -------------------------------------------------------
     def get_recommended_jobs(self, user_data: dict, max_results: int = 15) -> List[Dict]:
         profile = self.extract_user_profile(user_data)
-        print("🔍 Searching jobs for:", profile)
+        logger.info("Searching jobs for: %s", profile)
 
-        all_jobs = []
-
-        # Fetch jobs for top 3 inferred titles
-        for title in profile["job_titles"][:3]:
-            all_jobs += self.search_jobs_jsearch(title)
-            all_jobs += self.search_jobs_remoteok(title)
-            all_jobs += self.search_jobs_adzuna(title)
+        # Fetch jobs for top 3 inferred titles, all sources concurrently
+        titles = profile["job_titles"][:3]
+        try:
+            asyncio.get_running_loop()
+            all_jobs = self._fetch_all_jobs_threaded(titles)
+        except RuntimeError:
+            all_jobs = asyncio.run(self._fetch_all_jobs(titles))
 
         # Remove duplicates
         unique = {}
         for job in all_jobs:
-            key = (job["title"].lower(), job["company"].lower())
-            if key not in unique:
-                unique[key] = job
+            # _key is set at ingestion; pop it so it never reaches the cache or UI
+            unique.setdefault(job.pop("_key"), job)
 
         ranked = self.rank_jobs_by_relevance(list(unique.values()), profile)
 
         # Save cache
         self.save_jobs_cache(ranked[:max_results])
-        st.write("PROFILE DEBUG:", profile)
 
         return ranked[:max_results]
 
@@ -291,8 +473,7 @@ class JobRecommendationService:
             "jobs": jobs
         }
         os.makedirs("data", exist_ok=True)
-        with open(self.jobs_cache_path, "w") as f:
-            json.dump(data, f, indent=2)
+        write_json_atomic(self.jobs_cache_path, data)
 
     def load_jobs_cache(self, max_age_hours=24):
         if not os.path.exists(self.jobs_cache_path):
@@ -303,3 +484,10 @@ class JobRecommendationService:
         if datetime.utcnow() - ts > timedelta(hours=max_age_hours):
             return []
         return data["jobs"]
+
+
+@functools.lru_cache(maxsize=8)
+def _extract_profile_cached(user_data_json: str) -> tuple:
+    """Profile as a tuple of (key, value) pairs so the cached value can't be mutated."""
+    profile = JobRecommendationService._build_user_profile(json.loads(user_data_json))
+    return tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in profile.items())
@@ -1,9 +1,13 @@
 import os
 import json
-from langchain_groq import ChatGroq 
+import hashlib
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime
 import random
+from backend.app.utils.file_io import write_json_atomic
 load_dotenv()
 
 API_KEYS = [
@@ -14,59 +18,173 @@ API_KEYS = [
     os.getenv("GROQ_API_KEY_5"),
 ]
 
-def get_random_llm():
-    api_key = random.choice(API_KEYS)  # randomly pick a key
-    
-    # Initialize the LLM client with the selected key
-    llm = ChatGroq(
-        api_key= api_key,
-        model="openai/gpt-oss-20b",
-        temperature=0.7
+# Rotated keys, or the single GROQ_API_KEY when none of the numbered ones is set
+_KEYS = [k for k in API_KEYS if k] or [k for k in [os.getenv("GROQ_API_KEY")] if k]
+
+@functools.lru_cache(maxsize=32)
+def _get_llm(model: str, temperature: float, key_idx: int, json_mode: bool = False):
+    # Memoized so each (model, temperature, key) keeps one client and its HTTP connection pool
+    from langchain_groq import ChatGroq
+    model_kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+    return ChatGroq(
+        api_key=_KEYS[key_idx],
+        model=model,
+        temperature=temperature,
+        model_kwargs=model_kwargs
     )
-    return llm
 
+def get_llm(model="openai/gpt-oss-20b", temperature=0.7, json_mode=False):
+    """Shared ChatGroq client for a randomly picked API key."""
+    if not _KEYS:
+        raise RuntimeError("No Groq API key configured: set GROQ_API_KEY or GROQ_API_KEY_1..5")
+    return _get_llm(model, temperature, random.randrange(len(_KEYS)), json_mode)
 
+# prompt hash -> Future of the request currently in flight
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
 
-PROJECT_DETAILS_DIR = os.path.join("data", "project_details")
-os.makedirs(PROJECT_DETAILS_DIR, exist_ok=True)
+class CoalescingLLM:
+    """
+    Wraps a chat client so identical concurrent invoke() calls (double clicks,
+    reruns mid-call) share one request. Everything else is passed through.
+    """
 
-import os
-import json
-from datetime import datetime
+    def __init__(self, inner, scope: str = ""):
+        self.inner = inner
+        self.scope = scope  # model settings; the same prompt on another model is a different request
+
+    def invoke(self, prompt, *args, **kwargs):
+        if args or kwargs:
+            return self.inner.invoke(prompt, *args, **kwargs)
+
+        key = hashlib.sha256(f"{self.scope}\n{prompt}".encode("utf-8")).hexdigest()
+        with _INFLIGHT_LOCK:
+            future = _INFLIGHT.get(key)
+            owner = future is None
+            if owner:
+                future = _INFLIGHT[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            result = self.inner.invoke(prompt)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+def get_coalescing_llm(model="openai/gpt-oss-20b", temperature=0.7, json_mode=False):
+    """get_llm() wrapped in CoalescingLLM; shared across API keys."""
+    return CoalescingLLM(get_llm(model, temperature, json_mode), scope=f"{model}|{temperature}|{json_mode}")
+
+def get_random_llm():
+    return get_coalescing_llm()
 
-PROJECT_DETAILS_DIR = os.path.join("data", "project_details")
-os.makedirs(PROJECT_DETAILS_DIR, exist_ok=True)
 
-import os
-import json
 
 PROJECT_DETAILS_DIR = os.path.join("data", "project_details")
 os.makedirs(PROJECT_DETAILS_DIR, exist_ok=True)
 
+REFINE_CACHE_DIR = os.path.join("data", "refine_cache")
+os.makedirs(REFINE_CACHE_DIR, exist_ok=True)
+
 # -------------------------------------------------------------
-# SUB-FUNCTION 1: Generate Project Title
+# STATIC PROMPT PREFIXES
 # -------------------------------------------------------------
-def generate_project_title(repo_name, readme, files, llm):
-    llm = get_random_llm()
-    prompt = f"""
+# Instructions come first and byte-identical on every call so the provider's
+# prompt-prefix cache can reuse them; per-project data is appended last.
+TITLE_PREAMBLE = """
     You are an expert AI system that generates professional, descriptive project titles for GitHub repositories.
 
-    Repository name: {repo_name}
-    README (if present): {readme[:1200]}
-    File names: {', '.join(files[:30])}
-
     Rules:
     - The title must sound professional, concise, and suitable for a resume.
     - Use contextual hints (e.g., "langchain" + "chatbot" → "Agentic Chatbot using LangChain").
     - Format: “Descriptive Title using [Core Technologies or Concepts]”.
     - Word count should be between 3-5.
     - Return only the title text, nothing else.
+"""
+
+TECH_PREAMBLE = """
+    You are a specialized AI model that extracts technologies, frameworks, and libraries used in a project.
+
+    Task:
+    - Identify and list all relevant technologies (e.g., Python, LangChain, TensorFlow, Flask, React).
+    - If no technology is explicitely mentioned then based on topics and all the names and words listed generate and guess the technologies that might have been used.
+    - If tech count exceeds 5 then ONLY follow following rules:
+        = Count only major technologies and most critical one especially those which are rare.
+        = Also if you see under the umbrella 2 technologies or tools or software are used replace by major one like pandas , numpy , seaborn can come under python.
+    - Return a JSON array of strings only, e.g. ["Python", "LangChain", "FastAPI"].
+"""
+
+FEATURES_PREAMBLE = """
+    You are an expert technical resume writer with deep understanding of how to present projects attractively for recruiters.
+
+    TASK:
+    1. Analyze the provided repository details (given as INPUTS at the end) to infer the purpose, functionality, and technical depth of the project.
+    2. Based on the "role" field, generate exactly **3 resume-ready bullet points** that:
+    - Emphasize relevant technical and analytical skills.
+    - Highlight design, implementation, and impact aspects.
+    - Sound sophisticated and recruiter-attractive.
+    - Are concise (one line each), professional, and in active voice.
+    3. Adapt the language to match the role (for example, emphasize analytics and data insight for a Data Scientist, or backend architecture for a Software Engineer).
+
+    OUTPUT FORMAT:
+    Return strictly valid JSON:
+    {
+    "features": [
+        "bullet point 1",
+        "bullet point 2",
+        "bullet point 3"
+    ]
+    }
+
+    No extra commentary or markdown — only the JSON object.
+"""
+
+REFINE_PREAMBLE = """
+    You will be given bullet-point features describing a project, a target role and a user request.
+    Rewrite or refine these features to make them better,
+    following these rules:
+    - Tailor the features based on the role given by the user.
+    - Keep the same list structure (a JSON list of strings).
+    - Keep each feature concise (1–2 lines max).
+    - Maintain a professional, resume-style tone.
+
+    Return **only** the refined JSON list (no markdown, no extra text).
+"""
+
+def _invoke_text(llm, prompt, on_token=None) -> str:
+    """Run the prompt and return the text; streams through `on_token` when given."""
+    if on_token is None:
+        response = llm.invoke(prompt)
+        return getattr(response, "content", str(response))
+    chunks = []
+    for chunk in llm.stream(prompt):
+        text = getattr(chunk, "content", str(chunk))
+        chunks.append(text)
+        on_token(text)
+    return "".join(chunks)
+
+# -------------------------------------------------------------
+# SUB-FUNCTION 1: Generate Project Title
+# -------------------------------------------------------------
+def generate_project_title(repo_name, readme, files, llm):
+    prompt = TITLE_PREAMBLE + f"""
+    Repository name: {repo_name}
+    README (if present): {readme[:1200]}
+    File names: {', '.join(files[:30])}
     """
 
     try:
         response = llm.invoke(prompt)
         title = getattr(response, "content", str(response)).strip().replace('"', '')
-        print("title:",title)
         return title
     except Exception as e:
         print(f"[ERROR] Title generation failed for {repo_name}: {e}")
@@ -77,21 +195,10 @@ def generate_project_title(repo_name, readme, files, llm):
 # SUB-FUNCTION 2: Extract Technologies
 # -------------------------------------------------------------
 def extract_technologies(requirements, files, llm):
-    llm = get_random_llm()
-    prompt = f"""
-    You are a specialized AI model that extracts technologies, frameworks, and libraries used in a project.
-
+    prompt = TECH_PREAMBLE + f"""
     Given:
     - Requirements.txt content: {requirements}
     - File names: {files[:40]}
-
-    Task:
-    - Identify and list all relevant technologies (e.g., Python, LangChain, TensorFlow, Flask, React).
-    - If no technology is explicitely mentioned then based on topics and all the names and words listed generate and guess the technologies that might have been used.
-    - If tech count exceeds 5 then ONLY follow following rules:
-        = Count only major technologies and most critical one especially those which are rare.
-        = Also if you see under the umbrella 2 technologies or tools or software are used replace by major one like pandas , numpy , seaborn can come under python.
-    - Return a JSON array of strings only, e.g. ["Python", "LangChain", "FastAPI"].
     """
 
     try:
@@ -108,11 +215,8 @@ def extract_technologies(requirements, files, llm):
 # SUB-FUNCTION 3: Generate Project Features
 # -------------------------------------------------------------
 
-def generate_project_features(title, techs, readme, files, role, llm):
-    llm = get_random_llm()
-    prompt = f"""
-    You are an expert technical resume writer with deep understanding of how to present projects attractively for recruiters.
-
+def generate_project_features(title, techs, readme, files, role, llm, on_token=None):
+    prompt = FEATURES_PREAMBLE + f"""
     INPUTS:
     - A JSON object containing the following fields:
     {{
@@ -122,34 +226,11 @@ def generate_project_features(title, techs, readme, files, role, llm):
         "files_name": [{', '.join(f'"{f}"' for f in files[:20])}],
         "role": "{role}"
     }}
-
-    TASK:
-    1. Analyze the provided repository details to infer the purpose, functionality, and technical depth of the project.
-    2. Based on the "role" field, generate exactly **3 resume-ready bullet points** that:
-    - Emphasize relevant technical and analytical skills.
-    - Highlight design, implementation, and impact aspects.
-    - Sound sophisticated and recruiter-attractive.
-    - Are concise (one line each), professional, and in active voice.
-    3. Adapt the language to match the role (for example, emphasize analytics and data insight for a Data Scientist, or backend architecture for a Software Engineer).
-
-    OUTPUT FORMAT:
-    Return strictly valid JSON:
-    {{
-    "features": [
-        "bullet point 1",
-        "bullet point 2",
-        "bullet point 3"
-    ]
-    }}
-
-    No extra commentary or markdown — only the JSON object.
     """
 
     try:
-        response = llm.invoke(prompt)
-
         # Get raw text output (works for both object and string)
-        raw_output = getattr(response, "content", str(response))
+        raw_output = _invoke_text(llm, prompt, on_token)
 
         # Attempt to parse JSON safely
         parsed = json.loads(raw_output)
@@ -173,10 +254,9 @@ def generate_project_features(title, techs, readme, files, role, llm):
 # -------------------------------------------------------------
 # MAIN FUNCTION: Summarize Project (modular composition)
 # -------------------------------------------------------------
-def summarize_project(repo,role, llm=None):
-    llm = get_random_llm()
-    if llm is None:
-        from backend.app.services.llm_service import llm
+def summarize_project(repo,role, llm=None, on_token=None):
+    """`on_token` (optional) receives the feature bullets' tokens as they stream."""
+    llm = llm or get_random_llm()
 
     repo_name = repo.get("repository") or repo.get("repo") or repo.get("name") or "UnnamedRepo"
     readme = repo.get("readme", "")
@@ -190,7 +270,7 @@ def summarize_project(repo,role, llm=None):
     techs = extract_technologies(requirements, files, llm)
 
     # 3️⃣ Generate 3 Features
-    features = generate_project_features(title, requirements, readme, files,role, llm)
+    features = generate_project_features(title, requirements, readme, files,role, llm, on_token)
 
     # 4️⃣ Combine into final JSON
     data = {
@@ -213,28 +293,51 @@ def summarize_project(repo,role, llm=None):
     return data
 
 
+def summarize_projects(repos: list, role, max_workers: int = 8):
+    """
+    Summarize many repos concurrently; at most `max_workers` in flight to stay
+    under Groq rate limits. Returns (summaries in input order, errors).
+    """
+    summaries, errors = [], []
+    if not repos:
+        return summaries, errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(repos))) as executor:
+        futures = [executor.submit(summarize_project, r, role) for r in repos]
+        for future in futures:
+            try:
+                summaries.append(future.result())
+            except Exception as e:
+                errors.append(e)
+    return summaries, errors
+
+
+def _refine_cache_key(features: list, role, user_msg: str) -> str:
+    return hashlib.sha256(json.dumps([features, role, user_msg], sort_keys=True).encode("utf-8")).hexdigest()
+
 def refine_project(features: list[str],role, user_msg: str):
-    llm = get_random_llm()
     """
     Refines only the list of project features based on user feedback.
     Returns a refined features list (same structure, no type errors).
+    Results are cached on disk by exact (features, role, instruction); near-duplicate
+    instructions are not reused, since "2 bullets" vs "3 bullets" embed almost identically.
     """
+    cache_path = os.path.join(REFINE_CACHE_DIR, f"{_refine_cache_key(features, role, user_msg)}.json")
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass
+
+    llm = get_random_llm()
     # Build clear prompt for the LLM
-    prompt = f"""
-    The following are bullet-point features describing a project:
+    prompt = REFINE_PREAMBLE + f"""
+    Role: {role}
 
+    Features:
     {json.dumps(features, indent=2)}
 
     User request: "{user_msg}"
-
-    Rewrite or refine these features to make them better, 
-    following these rules:
-    - Tailoe the features based on role given by user {role}.
-    - Keep the same list structure (a JSON list of strings).
-    - Keep each feature concise (1–2 lines max).
-    - Maintain a professional, resume-style tone.
-
-    Return **only** the refined JSON list (no markdown, no extra text).
     """
 
     # Call your LLM
@@ -246,8 +349,9 @@ def refine_project(features: list[str],role, user_msg: str):
         if not isinstance(refined_features, list):
             raise ValueError("Response is not a JSON list")
     except Exception:
-        refined_features = features  # fallback to original if parsing fails
+        return features  # fallback to original if parsing fails; not cached
 
+    write_json_atomic(cache_path, refined_features)
     return refined_features
 
 
@@ -0,0 +1,65 @@
+# backend/app/services/onnx_embedder.py
+
+import os
+import numpy as np
+
+# One-time export (int8, CPU):
+#   optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 --optimize O3 models/minilm-onnx
+#   optimum-cli onnxruntime quantize --onnx_model models/minilm-onnx --avx2 -o models/minilm-int8
+# (use --arm64 instead of --avx2 on ARM). The output dir holds model_quantized.onnx + tokenizer.json.
+ONNX_MODEL_DIR = "models/minilm-int8"
+MAX_SEQ_LENGTH = 256  # same truncation as sentence-transformers' MiniLM
+
+
+def onnx_model_path():
+    """Return the exported model file if present, else None."""
+    for name in ("model_quantized.onnx", "model.onnx"):
+        path = os.path.join(ONNX_MODEL_DIR, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class OnnxMiniLMEmbeddings:
+    """
+    MiniLM sentence embeddings on ONNX Runtime: tokenize, run, mean-pool,
+    L2-normalize. Drop-in for the embed_documents/embed_query interface
+    of HuggingFaceEmbeddings, without torch on the hot path.
+    """
+
+    def __init__(self, model_path: str, batch_size: int = 32):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.batch_size = batch_size
+        self.session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(os.path.join(os.path.dirname(model_path), "tokenizer.json"))
+        self.tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def _run(self, texts: list) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encodings], dtype="int64")
+        mask = np.array([e.attention_mask for e in encodings], dtype="int64")
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+
+        hidden = self.session.run(None, feeds)[0]
+        weights = mask[..., None].astype("float32")
+        pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, texts: list, batch_size: int = None) -> np.ndarray:
+        """Encode texts into a (n, 384) float32 array of unit vectors."""
+        if not texts:
+            return np.zeros((0, 384), dtype="float32")
+        size = batch_size or self.batch_size
+        return np.vstack([self._run(texts[i:i + size]) for i in range(0, len(texts), size)]).astype("float32")
+
+    def embed_documents(self, texts: list) -> list:
+        return self.encode(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> list:
+        return self.encode([text])[0].tolist()
@@ -1,8 +1,13 @@
 # backend/app/services/qualification_service.py
 
 import os
-import re
 import json
+import orjson
+import hashlib
+import atexit
+import functools
+import threading
+import contextlib
 import smtplib
 from datetime import datetime
 from email.message import EmailMessage
@@ -12,6 +17,79 @@ import sys
 sys.path.append(r"C:\Users\Harsh\Downloads\Q_A_Chatbot_Using_Agentic_RAG_Architecture\q_a_chatbot\backend\app\services")
 
 from backend.app.services.user_data_service import load_user_data, save_user_data
+from backend.app.utils.json_block import extract_json_block
+from backend.app.utils.file_io import write_json_atomic
+
+QUALIFICATION_CACHE_PATH = os.path.join("data", "qualification_cache.json")
+_QUALIFICATION_LOCK = threading.Lock()
+
+
+# -----------------------------------
+# 🗂️ VERDICT CACHE (resume + cgpa + skill → result)
+# -----------------------------------
+def _qualification_key(parsed_data: dict, cgpa: str, skill: str) -> str:
+    payload = json.dumps(parsed_data, sort_keys=True, ensure_ascii=False) + str(cgpa) + str(skill)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _qualification_cache() -> dict:
+    """Verdicts persisted on disk, loaded once per process and updated in place."""
+    if os.path.exists(QUALIFICATION_CACHE_PATH):
+        try:
+            with open(QUALIFICATION_CACHE_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            # Only a cache: start over rather than failing the qualification check
+            print(f"⚠️ Ignoring unreadable qualification cache: {e}")
+    return {}
+
+
+def _store_qualification(key: str, result: dict):
+    # Sessions share the dict and the file; serialize updates and replace the file atomically
+    with _QUALIFICATION_LOCK:
+        cache = _qualification_cache()
+        cache[key] = result
+        os.makedirs(os.path.dirname(QUALIFICATION_CACHE_PATH), exist_ok=True)
+        write_json_atomic(QUALIFICATION_CACHE_PATH, cache)
+
+
+# -----------------------------------
+# 🔌 SHARED SMTP CONNECTION
+# -----------------------------------
+# One authenticated Gmail connection per process; TLS + AUTH is most of the cost of a send
+_SMTP = {"conn": None, "key": None}
+_SMTP_LOCK = threading.Lock()
+
+
+def _close_smtp():
+    conn, _SMTP["conn"] = _SMTP["conn"], None
+    if conn is not None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+
+@contextlib.contextmanager
+def get_smtp(user: str, password: str):
+    """Yield the cached, logged-in SMTP_SSL connection, opening it on first use."""
+    # Keyed on both credentials (hashed), so a rotated password opens a new session
+    key = hashlib.sha256(f"{user}\0{password}".encode("utf-8")).hexdigest()
+    with _SMTP_LOCK:
+        if _SMTP["conn"] is None or _SMTP["key"] != key:
+            _close_smtp()
+            conn = smtplib.SMTP_SSL("smtp.gmail.com", 465)
+            try:
+                conn.login(user, password)
+            except BaseException:
+                conn.close()
+                raise
+            _SMTP.update(conn=conn, key=key)
+        yield _SMTP["conn"]
+
+
+atexit.register(_close_smtp)
 
 
 # -----------------------------------
@@ -51,10 +129,15 @@ def send_email_gmail(subject: str, body: str):
     msg.set_content(body)
 
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as smtp:
-            smtp.starttls()
-            smtp.login(EMAIL_USER, EMAIL_PASS)
-            smtp.send_message(msg)
+        try:
+            with get_smtp(EMAIL_USER, EMAIL_PASS) as smtp:
+                smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Gmail drops idle connections; reconnect once
+            with _SMTP_LOCK:
+                _close_smtp()
+            with get_smtp(EMAIL_USER, EMAIL_PASS) as smtp:
+                smtp.send_message(msg)
         st.success(f"📧 Email sent to {receiver_email}")
         return True
     except Exception as e:
@@ -94,20 +177,25 @@ def verify_and_notify_qualification(parsed_data: dict, cgpa: str, skill: str, ll
         """
 
     # --------------------------
-    # Step 1: Run LLM grading
+    # Step 1: Run LLM grading (skipped if this exact check was done before)
     # --------------------------
-    with st.spinner("🤖 Checking qualifications using AI..."):
-        try:
-            resp = llm.invoke(prompt)
-            text = getattr(resp, "content", str(resp))
-            match = re.search(r'\{[\s\S]*\}', text)
-            data = json.loads(match.group(0)) if match else json.loads(text)
-            decision = data.get("decision", "").title()
-            score = int(data.get("score", 0))
-            reason = data.get("reason", "")
-        except Exception as e:
-            st.error(f"❌ LLM verification failed: {e}")
-            return None
+    cache_key = _qualification_key(parsed_data, cgpa, skill)
+    cached = _qualification_cache().get(cache_key)
+    if cached:
+        decision, score, reason = cached["decision"], cached["score"], cached["reason"]
+    else:
+        with st.spinner("🤖 Checking qualifications using AI..."):
+            try:
+                resp = llm.invoke(prompt)
+                text = getattr(resp, "content", str(resp))
+                data = orjson.loads(extract_json_block(text))
+                decision = data.get("decision", "").title()
+                score = int(data.get("score", 0))
+                reason = data.get("reason", "")
+            except Exception as e:
+                st.error(f"❌ LLM verification failed: {e}")
+                return None
+        _store_qualification(cache_key, {"decision": decision, "score": score, "reason": reason})
 
     # --------------------------
     # Step 2: Save Result
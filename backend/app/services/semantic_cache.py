@@ -0,0 +1,167 @@
+# backend/app/services/semantic_cache.py
+
+import re
+import asyncio
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Numbers and negations flip an answer while barely moving the embedding
+NEGATIONS = frozenset({"no", "not", "never", "none", "nor", "without", "except", "cannot"})
+NUMBER_WORDS = frozenset({"one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten"})
+_WORD_RE = re.compile(r"[a-z0-9']+")
+GUARD_CANDIDATES = 4  # nearest neighbours checked for a guard match
+
+
+def _guard_tokens(text: str) -> frozenset:
+    """Tokens that must match exactly for a semantic (non-SHA1) hit."""
+    return frozenset(
+        t for t in _WORD_RE.findall(text.lower())
+        if t in NEGATIONS or t in NUMBER_WORDS or t.endswith("n't") or any(c.isdigit() for c in t)
+    )
+
+
+class SemanticCache:
+    """
+    In-process LRU cache of LLM responses keyed by prompt text.
+    An exact SHA1 match is tried first; otherwise the nearest cached prompt
+    (cosine similarity over MiniLM embeddings) is reused if it clears `threshold`
+    and has the same numbers and negations ("top 3" != "top 2", "no Java" != "Java").
+    With `exact_only`, only the SHA1 tier is used and nothing is embedded.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1024, exact_only: bool = False):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.exact_only = exact_only
+        self.version = None
+        self._entries = OrderedDict()  # sha1 -> (vector, response, guard tokens)
+        self._keys = []                # FAISS row -> sha1
+        self._index = None
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys = []
+            self._index = None
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _embed(text: str) -> np.ndarray:
+        # Imported lazily: FAISS and the embedder are only needed once something is cached
+        import faiss
+        from backend.app.services.embedding_service import get_embedder
+        vec = np.asarray([get_embedder().embed_query(text)], dtype="float32")
+        faiss.normalize_L2(vec)
+        return vec
+
+    def _rebuild(self):
+        import faiss
+        vecs = np.vstack([v for v, _, _ in self._entries.values()])
+        self._index = faiss.IndexFlatIP(vecs.shape[1])
+        self._index.add(vecs)
+        self._keys = list(self._entries.keys())
+
+    def lookup(self, text: str):
+        """Return (hit, response, vector). `vector` is None on an exact hit."""
+        key = self._hash(text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True, self._entries[key][1], None
+        if self.exact_only:
+            return False, None, None
+
+        vec = self._embed(text)
+        with self._lock:
+            if not self._entries:
+                return False, None, vec
+            if self._index is None:
+                self._rebuild()
+            guard = _guard_tokens(text)
+            scores, ids = self._index.search(vec, min(GUARD_CANDIDATES, self._index.ntotal))
+            for score, idx in zip(scores[0], ids[0]):
+                if idx < 0 or score < self.threshold:
+                    break
+                hit_key = self._keys[idx]
+                entry = self._entries.get(hit_key)
+                if entry is not None and entry[2] == guard:
+                    self._entries.move_to_end(hit_key)
+                    return True, entry[1], vec
+        return False, None, vec
+
+    def store(self, text: str, response, vec: np.ndarray = None):
+        key = self._hash(text)
+        if vec is None and not self.exact_only:
+            vec = self._embed(text)
+        guard = None if self.exact_only else _guard_tokens(text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._entries[key] = (vec, response, guard)
+                return
+            self._entries[key] = (vec, response, guard)
+            if len(self._entries) > self.max_entries:
+                # Evict least-recently-used entry; FAISS flat indices can't drop rows cheaply
+                self._entries.popitem(last=False)
+                self._index = None
+            elif self._index is not None and vec is not None:
+                self._index.add(vec)
+                self._keys.append(key)
+
+
+def _key_text(args, kwargs) -> str:
+    parts = [str(a) for a in args] + [f"{k}={v}" for k, v in sorted(kwargs.items())]
+    return "\n".join(parts)
+
+
+def semantic_cache(threshold: float = 0.95, max_entries: int = 1024, exact_only: bool = False, version=None):
+    """
+    Decorator caching a function's result on the semantic key of its arguments.
+    `version` is an optional zero-arg callable (e.g. index mtimes); the cache is
+    dropped whenever its value changes, so answers never outlive their data.
+    """
+    def decorator(fn):
+        cache = SemanticCache(threshold, max_entries, exact_only)
+
+        def check_version():
+            if version is not None:
+                current = version()
+                if current != cache.version:
+                    cache.clear()
+                    cache.version = current
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                check_version()
+                text = _key_text(args, kwargs)
+                # Embedding is CPU-bound; keep it off the event loop
+                hit, value, vec = await asyncio.to_thread(cache.lookup, text)
+                if hit:
+                    return value
+                value = await fn(*args, **kwargs)
+                await asyncio.to_thread(cache.store, text, value, vec)
+                return value
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                check_version()
+                text = _key_text(args, kwargs)
+                hit, value, vec = cache.lookup(text)
+                if hit:
+                    return value
+                value = fn(*args, **kwargs)
+                cache.store(text, value, vec)
+                return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
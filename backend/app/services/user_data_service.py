@@ -1,17 +1,28 @@
 # backend/app/services/user_data_service.py
 
-import os, json
+import os, json, copy
+from backend.app.utils.file_io import write_json_atomic
 
 DATA_DIR = "data"
 USER_DATA_PATH = os.path.join(DATA_DIR, "user_data.json")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Parsed user_data.json, reused until the file's mtime changes
+_CACHE = {"mtime": None, "data": None}
+
 def load_user_data():
-    if os.path.exists(USER_DATA_PATH):
+    try:
+        mtime = os.path.getmtime(USER_DATA_PATH)
+    except OSError:
+        return {}
+    if mtime != _CACHE["mtime"]:
         with open(USER_DATA_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+            _CACHE["data"] = json.load(f)
+        _CACHE["mtime"] = mtime
+    # Callers mutate the result before saving, so hand out a copy
+    return copy.deepcopy(_CACHE["data"])
 
 def save_user_data(data):
-    with open(USER_DATA_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_json_atomic(USER_DATA_PATH, data)
+    _CACHE["data"] = copy.deepcopy(data)
+    _CACHE["mtime"] = os.path.getmtime(USER_DATA_PATH)
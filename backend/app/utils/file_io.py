@@ -0,0 +1,50 @@
+import os
+import json
+import tempfile
+import orjson
+
+
+def _same_content(path: str, payload: bytes) -> bool:
+    """True if the file on disk already holds exactly `payload`."""
+    try:
+        if os.path.getsize(path) != len(payload):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == payload
+    except OSError:
+        return False
+
+
+def write_json_atomic(path: str, data, indent: int = 2) -> bool:
+    """
+    Write `data` as JSON via a temp file + os.replace so readers never see a
+    partial file. Returns False (and touches nothing) if the file on disk already
+    holds the same content.
+    """
+    payload = None
+    if indent in (2, None):
+        # orjson serializes straight to UTF-8 bytes in C; it only knows 2-space indent
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass  # e.g. non-str keys; stdlib handles those
+    if payload is None:
+        payload = json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+    if _same_content(path, payload):
+        return False
+
+    # Unique temp file in the target directory, so concurrent writers never share one
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
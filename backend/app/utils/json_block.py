@@ -0,0 +1,31 @@
+def extract_json_block(text: str) -> str:
+    """
+    Return the first balanced {...} object in `text` (e.g. an LLM reply wrapped
+    in prose or code fences). Single forward scan that skips braces inside
+    string literals; no regex, so no backtracking on stray braces.
+    Falls back to the stripped text when no complete object is found.
+    """
+    start = text.find("{")
+    if start == -1:
+        return text.strip()
+
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text.strip()
@@ -1,19 +1,20 @@
 import os
 import sys
 import json
-import re
-import random
+import orjson
+import hashlib
 import shutil
-import base64
 import tempfile
+import threading
 import subprocess
 from typing import Dict, List
 from datetime import datetime
 
+import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 import fitz  # PyMuPDF
+import pypdfium2 as pdfium
 
 # ===============================
 # PATHS & PYTHONPATH
@@ -27,30 +28,106 @@ DATA_DIR = r"C:\Users\Harsh\Downloads\resume-agent\resume-agent-builder\data"
 USER_DATA_PATH = os.path.join(DATA_DIR, "user_data.json")
 GITHUB_REPO_PATH = os.path.join(DATA_DIR, "github_repos")
 PROJECT_DETAILS_DIR = os.path.join(DATA_DIR, "project_details")
+RESUME_CACHE_DIR = os.path.join(DATA_DIR, "resume_cache")
+PDF_CACHE_DIR = os.path.join(DATA_DIR, "pdf_cache")
+PDF_TEXT_CACHE_DIR = os.path.join(DATA_DIR, ".pdftext_cache")
+# Served at /app/static/ (server.enableStaticServing in .streamlit/config.toml)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# Bump when extract_prompt's schema changes so old cached parses are ignored
+RESUME_PROMPT_VERSION = "v1"
+PDFLATEX_TIMEOUT = 60  # seconds
+# Newest files kept in each generated-file cache
+PDF_CACHE_KEEP = 20
+PDF_TEXT_CACHE_KEEP = 50
 
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(GITHUB_REPO_PATH, exist_ok=True)
 os.makedirs(PROJECT_DETAILS_DIR, exist_ok=True)
+os.makedirs(RESUME_CACHE_DIR, exist_ok=True)
+os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+os.makedirs(STATIC_DIR, exist_ok=True)
+
+# Date picker options, built once per rerun and shared by every project's selectboxes
+TODAY = datetime.now()
+MONTHS = tuple(range(1, 13))
+YEARS = tuple(range(TODAY.year - 5, TODAY.year + 2))
 
 # ===============================
 # BACKEND IMPORTS
 # ===============================
 from backend.app.services.github_service import fetch_and_analyze_github
-from backend.app.services.llm_service import summarize_project, fix_latex_syntax_with_llm
+from backend.app.services.llm_service import get_coalescing_llm, summarize_projects, fix_latex_syntax_with_llm
 from backend.app.services.latex_service import generate_resume_latex
 from backend.app.services.job_recommendation_service import JobRecommendationService
 from backend.app.services.job_application_service import JobApplicationService
+from backend.app.utils.file_io import write_json_atomic
+from backend.app.utils.json_block import extract_json_block
 from project_refine_modal import refine_project  # your refine helper
 
 # ===============================
 # ENV & LLM
 # ===============================
 load_dotenv()
-API_KEYS = [os.getenv(f"GROQ_API_KEY_{i}") for i in range(1, 6)]
 
 def get_random_llm():
-    key = random.choice([k for k in API_KEYS if k])
-    return ChatGroq(api_key=key, model="openai/gpt-oss-120b", temperature=0.7)
+    return get_coalescing_llm(model="openai/gpt-oss-120b", temperature=0.7)
+
+# Static instructions + schema first, byte-identical on every call, so the
+# provider can serve the prefix from its prompt cache; the resume text goes last.
+RESUME_SCHEMA_PREAMBLE = """
+    You are an advanced AI resume parser.
+    Extract all key information from the resume text given at the end.
+    Always return lists even if only one entry is found.
+
+    Return valid JSON in the following structure:
+    {
+      "name": "",
+      "phone": "",
+      "email": "",
+      "linkedin": "",
+      "github": "",
+      "education": [
+        {
+          "institution": "",
+          "period": "",
+          "degree": "",
+          "cgpa": "",
+          "location": ""
+        }
+      ],
+      "languages": [],
+      "tools": [],
+      "coursework": [],
+      "experience": [
+        {
+          "company": "",
+          "role": "",
+          "start": "",
+          "end": "",
+          "city": "",
+          "country": "",
+          "items": []
+        }
+      ],
+      "achievements": [
+        {
+          "title": "",
+          "link": "",
+          "category": "",
+          "items": []
+        }
+      ],
+      "projects": [
+        {
+          "title": "",
+          "technologies": [],
+          "date": "",
+          "features": []
+        }
+      ]
+    }
+"""
 
 # ===============================
 # HELPERS: USER DATA & PROJECTS
@@ -65,12 +142,17 @@ def load_user_data() -> Dict:
     return {}
 
 def save_user_data(data: Dict):
-    with open(USER_DATA_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_json_atomic(USER_DATA_PATH, data)
 
 def update_user_data(key: str, value):
-    st.session_state["user_data"][key] = value
-    save_user_data(st.session_state["user_data"])
+    # Only mark dirty; flush_user_data() writes once at the end of the rerun
+    if st.session_state["user_data"].get(key) != value:
+        st.session_state["user_data"][key] = value
+        st.session_state["_user_data_dirty"] = True
+
+def flush_user_data():
+    if st.session_state.pop("_user_data_dirty", False):
+        save_user_data(st.session_state["user_data"])
 
 def update_from_resume(parsed_data: dict):
     st.session_state["user_data"] = parsed_data
@@ -85,18 +167,32 @@ def save_projects(projects: List[Dict]):
         with open(path, "w", encoding="utf-8") as f:
             json.dump(p, f, ensure_ascii=False, indent=2)
 
+def _dir_fingerprint(folder: str) -> tuple:
+    """(name, mtime) of every JSON file; changes whenever a file is added, removed or rewritten."""
+    return tuple(
+        (f, os.path.getmtime(os.path.join(folder, f)))
+        for f in sorted(os.listdir(folder)) if f.lower().endswith(".json")
+    )
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _read_json_dir(folder: str, fingerprint: tuple) -> List[tuple]:
+    """Parse every JSON file in `folder` once per fingerprint -> [(fname, data, error)]."""
+    results = []
+    for fname, _ in fingerprint:
+        try:
+            with open(os.path.join(folder, fname), "r", encoding="utf-8") as f:
+                results.append((fname, json.load(f), None))
+        except Exception as e:
+            results.append((fname, None, str(e)))
+    return results
+
 def load_local_projects() -> List[Dict]:
-    projects = []
     if not os.path.exists(GITHUB_REPO_PATH):
-        return projects
-    for f in os.listdir(GITHUB_REPO_PATH):
-        if f.endswith(".json"):
-            try:
-                with open(os.path.join(GITHUB_REPO_PATH, f), "r", encoding="utf-8") as file:
-                    projects.append(json.load(file))
-            except Exception:
-                pass
-    return projects
+        return []
+    return [
+        data for _, data, err in _read_json_dir(GITHUB_REPO_PATH, _dir_fingerprint(GITHUB_REPO_PATH))
+        if err is None
+    ]
 
 def save_projects_to_disk(projects: List[Dict]):
     for p in projects:
@@ -113,15 +209,11 @@ def load_projects_from_disk() -> List[Dict]:
     projects = []
     if not os.path.exists(GITHUB_REPO_PATH):
         return projects
-    for fname in sorted(os.listdir(GITHUB_REPO_PATH)):
-        if not fname.lower().endswith(".json"):
-            continue
-        full = os.path.join(GITHUB_REPO_PATH, fname)
-        try:
-            with open(full, "r", encoding="utf-8") as f:
-                projects.append(json.load(f))
-        except Exception as e:
-            st.warning(f"Could not read {fname}: {e}")
+    for fname, data, err in _read_json_dir(GITHUB_REPO_PATH, _dir_fingerprint(GITHUB_REPO_PATH)):
+        if err is not None:
+            st.warning(f"Could not read {fname}: {err}")
+        else:
+            projects.append(data)
     return projects
 
 def load_existing_summaries() -> List[Dict]:
@@ -130,20 +222,183 @@ def load_existing_summaries() -> List[Dict]:
         st.warning(f"⚠️ Project details folder not found: {PROJECT_DETAILS_DIR}")
         return summaries
 
-    files = sorted([f for f in os.listdir(PROJECT_DETAILS_DIR) if f.endswith(".json")])
-    if not files:
-        return summaries
+    for fname, data, err in _read_json_dir(PROJECT_DETAILS_DIR, _dir_fingerprint(PROJECT_DETAILS_DIR)):
+        if err is not None:
+            st.error(f"❌ Failed to load {fname}: {err}")
+        elif isinstance(data, dict) and "title" in data:
+            summaries.append(data)
+    return summaries
 
-    for fname in files:
-        full_path = os.path.join(PROJECT_DETAILS_DIR, fname)
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """Whole-document text via pdfium (fastest); PyMuPDF if pdfium can't read the file."""
+    try:
+        pdf = pdfium.PdfDocument(pdf_bytes)
         try:
-            with open(full_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, dict) and "title" in data:
-                    summaries.append(data)
-        except Exception as e:
-            st.error(f"❌ Failed to load {fname}: {e}")
-    return summaries
+            return "\n".join(page.get_textpage().get_text_range() for page in pdf)
+        finally:
+            pdf.close()
+    except Exception:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_doc:
+            return "".join(page.get_text("text") for page in pdf_doc)
+
+def _prune_dir(folder: str, keep: int, prefix: str = ""):
+    """Delete all but the `keep` most recently modified files in `folder`."""
+    try:
+        entries = [e for e in os.scandir(folder) if e.is_file() and e.name.startswith(prefix) and not e.name.startswith(".")]
+    except OSError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+def pdf_digest(pdf_bytes: bytes) -> str:
+    return hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+
+def get_pdf_text(pdf_bytes: bytes, digest: str) -> str:
+    """extract_pdf_text memoized by content hash in session_state and on disk."""
+    state_key = f"_pdftext_{digest}"
+    if state_key in st.session_state:
+        return st.session_state[state_key]
+
+    cache_path = os.path.join(PDF_TEXT_CACHE_DIR, f"{digest}.txt")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = extract_pdf_text(pdf_bytes)
+        # Unique dot-prefixed temp file: concurrent sessions never share it, pruning skips it
+        fd, tmp = tempfile.mkstemp(dir=PDF_TEXT_CACHE_DIR, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, cache_path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+        _prune_dir(PDF_TEXT_CACHE_DIR, PDF_TEXT_CACHE_KEEP)
+    st.session_state[state_key] = text
+    return text
+
+def _write_bytes(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def parse_llm_json(text: str):
+    """Cut out the first balanced JSON object (no regex scan) and decode with orjson."""
+    cleaned = extract_json_block(text)
+    try:
+        return orjson.loads(cleaned)
+    except orjson.JSONDecodeError:
+        # stdlib is laxer (NaN/Infinity) — last resort for sloppy model output
+        return json.loads(cleaned)
+
+def _resume_cache_key(pdf_text: str) -> str:
+    return hashlib.sha256(pdf_text.encode("utf-8") + RESUME_PROMPT_VERSION.encode("utf-8")).hexdigest()
+
+def _resume_cache_path(key: str) -> str:
+    return os.path.join(RESUME_CACHE_DIR, f"{key}.json")
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _read_resume_cache(path: str, mtime: float) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _load_cached_resume(key: str):
+    """Parsed resume JSON for this cache key, or None if never extracted."""
+    path = _resume_cache_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        return _read_resume_cache(path, os.path.getmtime(path))
+    except Exception:
+        return None
+
+def _latex_log_tail(tmpdir: str, returncode) -> str:
+    # pdflatex reports errors in its log, not on stderr; only read it when something went wrong
+    log_path = os.path.join(tmpdir, "resume.log")
+    if not os.path.exists(log_path):
+        return f"pdflatex exited with code {returncode}"
+    with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()[-4000:]
+
+def compile_latex_pdf(tex: str):
+    """
+    Compile LaTeX to PDF, cached by hash of the source.
+    Returns (pdf_path, log). pdf_path is None on failure; a non-empty log next
+    to a PDF means pdflatex hit recoverable errors but still produced output.
+    """
+    tex_hash = hashlib.sha256(tex.encode("utf-8")).hexdigest()
+    cached_pdf = os.path.join(PDF_CACHE_DIR, f"{tex_hash}.pdf")
+    if os.path.exists(cached_pdf):
+        os.utime(cached_pdf)  # recently used; survives pruning
+        return cached_pdf, ""
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tex_path = os.path.join(tmpdir, "resume.tex")
+        with open(tex_path, "w", encoding="utf-8") as f:
+            f.write(tex)
+
+        try:
+            returncode = subprocess.run(
+                ["pdflatex", "-interaction=nonstopmode", tex_path],
+                cwd=tmpdir,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=PDFLATEX_TIMEOUT,
+            ).returncode
+        except subprocess.TimeoutExpired:
+            return None, f"pdflatex did not finish within {PDFLATEX_TIMEOUT}s"
+
+        pdf_path = os.path.join(tmpdir, "resume.pdf")
+        if not os.path.exists(pdf_path):
+            return None, _latex_log_tail(tmpdir, returncode)
+        log = _latex_log_tail(tmpdir, returncode) if returncode != 0 else ""
+
+        # Unique dot-prefixed temp file: concurrent sessions never share it, pruning skips it
+        fd, tmp_pdf = tempfile.mkstemp(dir=PDF_CACHE_DIR, prefix=".", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(pdf_path, tmp_pdf)
+            os.replace(tmp_pdf, cached_pdf)
+        except OSError:
+            os.unlink(tmp_pdf)
+            raise
+    _prune_dir(PDF_CACHE_DIR, PDF_CACHE_KEEP)
+    return cached_pdf, log
+
+def publish_pdf_preview(pdf_path: str) -> str:
+    """Expose a cached PDF under the static dir once; returns its URL."""
+    name = f"preview_{os.path.basename(pdf_path)}"
+    static_path = os.path.join(STATIC_DIR, name)
+    if os.path.exists(static_path):
+        os.utime(static_path)
+    else:
+        shutil.copyfile(pdf_path, static_path)
+        _prune_dir(STATIC_DIR, PDF_CACHE_KEEP, prefix="preview_")
+    return f"/app/static/{name}"
+
+def list_input(widget, label: str, key: str, initial: list, sep: str = ","):
+    """
+    Text widget editing a list. The parsed list lives in session_state and is
+    re-split only in the widget's on_change, not on every rerun.
+    """
+    list_key, seed_key = f"_{key}_list", f"_{key}_seed"
+    if st.session_state.get(seed_key) != initial:
+        # First render, or the underlying data was replaced (e.g. resume upload)
+        st.session_state[key] = (", " if sep == "," else sep).join(initial)
+        st.session_state[list_key] = list(initial)
+        st.session_state[seed_key] = list(initial)
+
+    def _parse():
+        raw = st.session_state[key]
+        parts = raw.split(",") if sep == "," else raw.splitlines()
+        st.session_state[list_key] = [x.strip() for x in parts if x.strip()]
+
+    widget(label, key=key, on_change=_parse)
+    return st.session_state[list_key]
 
 def update_project_in_session(title: str, refined_features: list):
     summaries = st.session_state.get("summaries", [])
@@ -153,10 +408,15 @@ def update_project_in_session(title: str, refined_features: list):
             break
     st.session_state["summaries"] = summaries
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _read_json_file(path: str, mtime: float):
+    # mtime in the key: any save invalidates the cached parse
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 def load_user_projects_from_disk():
     if os.path.exists(USER_DATA_PATH):
-        with open(USER_DATA_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _read_json_file(USER_DATA_PATH, os.path.getmtime(USER_DATA_PATH))
     return {}
 
 # ===============================
@@ -183,8 +443,7 @@ role_value = st.text_input(
     value=user_data.get("role", ""),
     key="target_role_input"
 )
-if role_value != user_data.get("role", ""):
-    update_user_data("role", role_value)
+update_user_data("role", role_value)
 target_role = st.session_state["user_data"].get("role", "")
 
 # ===============================
@@ -197,115 +456,80 @@ mode = st.radio("Mode", ["Upload PDF resume", "Create from scratch"])
 if mode == "Upload PDF resume":
     uploaded = st.file_uploader("📄 Upload your resume (PDF)", type=["pdf"])
     if uploaded:
+        pdf_bytes = uploaded.getvalue()
+        pdf_hash = pdf_digest(pdf_bytes)
         save_path = os.path.join(DATA_DIR, uploaded.name)
-        with open(save_path, "wb") as f:
-            f.write(uploaded.getbuffer())
-        st.success(f"✅ Saved file to {save_path}")
+        if st.session_state.get("_saved_pdf") != (save_path, pdf_hash):
+            # Keep a copy on disk without making extraction wait for the write; once per file, not per rerun
+            threading.Thread(target=_write_bytes, args=(save_path, pdf_bytes), daemon=True).start()
+            st.session_state["_saved_pdf"] = (save_path, pdf_hash)
+        st.success(f"✅ Saving file to {save_path}")
 
         with st.spinner("🔍 Extracting text from resume..."):
-            pdf_doc = fitz.open(save_path)
-            pdf_text = "".join(page.get_text("text") for page in pdf_doc)
-            pdf_doc.close()
-
-        with st.spinner("🤖 Analyzing resume and extracting structured data..."):
-            extract_prompt = f"""
-            You are an advanced AI resume parser.
-            Extract all key information from the following resume text.
-            Always return lists even if only one entry is found.
-
-            Resume Text:
-            {pdf_text}
-
-            Return valid JSON in the following structure:
-            {{
-              "name": "",
-              "phone": "",
-              "email": "",
-              "linkedin": "",
-              "github": "",
-              "education": [
-                {{
-                  "institution": "",
-                  "period": "",
-                  "degree": "",
-                  "cgpa": "",
-                  "location": ""
-                }}
-              ],
-              "languages": [],
-              "tools": [],
-              "coursework": [],
-              "experience": [
-                {{
-                  "company": "",
-                  "role": "",
-                  "start": "",
-                  "end": "",
-                  "city": "",
-                  "country": "",
-                  "items": []
-                }}
-              ],
-              "achievements": [
-                {{
-                  "title": "",
-                  "link": "",
-                  "category": "",
-                  "items": []
-                }}
-              ],
-              "projects": [
-                {{
-                  "title": "",
-                  "technologies": [],
-                  "date": "",
-                  "features": []
-                }}
-              ]
-            }}
-            """
-            try:
-                resp = llm.invoke(extract_prompt)
-                response_text = getattr(resp, "content", str(resp))
-                match = re.search(r'\{[\s\S]*\}', response_text)
-                cleaned_json = match.group(0) if match else response_text.strip()
-                parsed_data = json.loads(cleaned_json)
-
-                # Normalize lists
-                for key in ["education", "experience", "projects", "achievements"]:
-                    if isinstance(parsed_data.get(key), dict):
-                        parsed_data[key] = [parsed_data[key]]
-                    elif key not in parsed_data:
-                        parsed_data[key] = []
-
-                update_from_resume(parsed_data)
-                st.success("✅ Resume data extracted and saved successfully!")
-                with st.expander("🧾 Preview Extracted Data"):
-                    st.json(parsed_data)
-
-            except json.JSONDecodeError:
-                st.error("❌ The AI response was not valid JSON. Try re-uploading or check resume formatting.")
-                st.text(response_text)
-            except Exception as e:
-                st.error(f"❌ Failed to extract resume fields: {e}")
+            pdf_text = get_pdf_text(pdf_bytes, pdf_hash)
+
+        # Same text + same prompt version -> reuse the earlier parse, skip the LLM
+        cache_key = _resume_cache_key(pdf_text)
+        cached_resume = _load_cached_resume(cache_key)
+        if cached_resume is not None:
+            # Apply once per parse: later reruns with the PDF still uploaded keep manual edits
+            if st.session_state.get("_applied_resume") != cache_key:
+                update_from_resume(cached_resume)
+                st.session_state["_applied_resume"] = cache_key
+            st.success("✅ Resume parsed before — loaded extracted data from cache!")
+            with st.expander("🧾 Preview Extracted Data"):
+                st.json(cached_resume)
+        else:
+            with st.spinner("🤖 Analyzing resume and extracting structured data..."):
+                extract_prompt = RESUME_SCHEMA_PREAMBLE + "\nResume Text:\n" + pdf_text
+                try:
+                    # Stream tokens so the user sees progress instead of a bare spinner
+                    chunks = []
+                    placeholder = st.empty()
+                    for tok in llm.stream(extract_prompt):
+                        chunks.append(getattr(tok, "content", str(tok)))
+                        placeholder.text("".join(chunks)[-500:])
+                    placeholder.empty()
+                    response_text = "".join(chunks)
+                    parsed_data = parse_llm_json(response_text)
+
+                    # Normalize lists
+                    for key in ["education", "experience", "projects", "achievements"]:
+                        if isinstance(parsed_data.get(key), dict):
+                            parsed_data[key] = [parsed_data[key]]
+                        elif key not in parsed_data:
+                            parsed_data[key] = []
+
+                    write_json_atomic(_resume_cache_path(cache_key), parsed_data)
+                    update_from_resume(parsed_data)
+                    st.session_state["_applied_resume"] = cache_key
+                    st.success("✅ Resume data extracted and saved successfully!")
+                    with st.expander("🧾 Preview Extracted Data"):
+                        st.json(parsed_data)
+
+                except json.JSONDecodeError:
+                    st.error("❌ The AI response was not valid JSON. Try re-uploading or check resume formatting.")
+                    st.text(response_text)
+                except Exception as e:
+                    st.error(f"❌ Failed to extract resume fields: {e}")
 
 # ---- Create from Scratch ----
 if mode == "Create from scratch" or st.button("Fill manual details"):
     st.subheader("Basic Information (auto-saves as you type)")
     name = st.text_input("Full name", value=user_data.get("name", ""))
-    if name != user_data.get("name", ""): update_user_data("name", name)
+    update_user_data("name", name)
 
     phone = st.text_input("Phone", value=user_data.get("phone", ""))
-    if phone != user_data.get("phone", ""): update_user_data("phone", phone)
+    update_user_data("phone", phone)
 
     email = st.text_input("Email", value=user_data.get("email", ""))
-    if email != user_data.get("email", ""): update_user_data("email", email)
+    update_user_data("email", email)
 
     linkedin = st.text_input("LinkedIn profile URL", value=user_data.get("linkedin", ""))
-    if linkedin != user_data.get("linkedin", ""): update_user_data("linkedin", linkedin)
+    update_user_data("linkedin", linkedin)
 
     github = st.text_input("GitHub profile URL or username", value=user_data.get("github", ""))
-    if github != user_data.get("github", ""): update_user_data("github", github)
+    update_user_data("github", github)
 
     st.subheader("Education (add multiple)")
     saved_edu = user_data.get("education", [])
@@ -323,15 +547,12 @@ if mode == "Create from scratch" or st.button("Fill manual details"):
     update_user_data("education", education)
 
     st.subheader("Coursework (comma separated)")
-    coursework_raw = st.text_input("Coursework list", value=", ".join(user_data.get("coursework", [])), key="coursework_raw")
-    coursework = [c.strip() for c in coursework_raw.split(",") if c.strip()]
+    coursework = list_input(st.text_input, "Coursework list", "coursework_raw", user_data.get("coursework", []))
     update_user_data("coursework", coursework)
 
     st.subheader("Technical skills")
-    lang_raw = st.text_input("Languages (comma separated)", value=", ".join(user_data.get("languages", [])), key="languages_raw")
-    languages = [x.strip() for x in lang_raw.split(",") if x.strip()]
-    tools_raw = st.text_input("Tools (comma separated)", value=", ".join(user_data.get("tools", [])), key="tools_raw")
-    tools = [x.strip() for x in tools_raw.split(",") if x.strip()]
+    languages = list_input(st.text_input, "Languages (comma separated)", "languages_raw", user_data.get("languages", []))
+    tools = list_input(st.text_input, "Tools (comma separated)", "tools_raw", user_data.get("tools", []))
     update_user_data("languages", languages)
     update_user_data("tools", tools)
 
@@ -348,11 +569,11 @@ if mode == "Create from scratch" or st.button("Fill manual details"):
             start = st.text_input("Start Date", value=prev.get("start", ""), key=f"estart_{i}")
             end = st.text_input("End Date", value=prev.get("end", ""), key=f"eend_{i}")
             role = st.text_input("Role", value=prev.get("role", ""), key=f"erole_{i}")
-            items = st.text_area("Bullet points (one per line)", value="\n".join(prev.get("items", [])), key=f"eitems_{i}")
+            items = list_input(st.text_area, "Bullet points (one per line)", f"eitems_{i}", prev.get("items", []), sep="\n")
             experience.append({
                 "company": company, "role": role, "start": start, "end": end,
                 "city": city, "country": country,
-                "items": [l.strip() for l in items.splitlines() if l.strip()]
+                "items": items
             })
     update_user_data("experience", experience)
 
@@ -366,10 +587,10 @@ if mode == "Create from scratch" or st.button("Fill manual details"):
             title = st.text_input("Title", value=prev.get("title", ""), key=f"atitle_{i}")
             link = st.text_input("Link (optional)", value=prev.get("link", ""), key=f"alink_{i}")
             category = st.text_input("Category", value=prev.get("category", ""), key=f"acat_{i}")
-            items = st.text_area("Items (one per line)", value="\n".join(prev.get("items", [])), key=f"aitems_{i}")
+            items = list_input(st.text_area, "Items (one per line)", f"aitems_{i}", prev.get("items", []), sep="\n")
             achievements.append({
                 "title": title, "link": link, "category": category,
-                "items": [l.strip() for l in items.splitlines() if l.strip()]
+                "items": items
             })
     update_user_data("achievements", achievements)
 
@@ -385,16 +606,14 @@ for i in range(int(proj_cnt)):
     prev = saved_projects[i] if i < len(saved_projects) else {}
     with st.expander(f"Project #{i+1}", expanded=(i == 0)):
         title = st.text_input("Project Title", value=prev.get("title", ""), key=f"mtitle_{i}")
-        tech_raw = st.text_input("Technologies (comma separated)", value=", ".join(prev.get("technologies", [])), key=f"mtech_{i}")
-        technologies = [t.strip() for t in tech_raw.split(",") if t.strip()]
+        technologies = list_input(st.text_input, "Technologies (comma separated)", f"mtech_{i}", prev.get("technologies", []))
         col1, col2 = st.columns(2)
         with col1:
-            month = st.selectbox("Month", [m for m in range(1, 13)], key=f"mmonth_{i}")
+            month = st.selectbox("Month", MONTHS, key=f"mmonth_{i}")
         with col2:
-            year = st.selectbox("Year", [y for y in range(datetime.now().year - 5, datetime.now().year + 2)], key=f"myear_{i}")
+            year = st.selectbox("Year", YEARS, key=f"myear_{i}")
         formatted_date = f"{month:02d}/{year}"
-        features_text = st.text_area("Features (bullet points, one per line)", value="\n".join(prev.get("features", [])), key=f"mfeat_{i}")
-        features = [f.strip() for f in features_text.splitlines() if f.strip()]
+        features = list_input(st.text_area, "Features (bullet points, one per line)", f"mfeat_{i}", prev.get("features", []), sep="\n")
         is_selected = st.checkbox(f"Select '{title}' for Resume", key=f"mselect_{i}")
         manual_projects.append({
             "title": title, "technologies": technologies, "date": formatted_date,
@@ -431,12 +650,9 @@ if st.button("Fetch GitHub Repositories"):
             st.success(f"✅ Fetched and stored {len(returned_projects)} repos (loaded {len(loaded)} from disk).")
         if loaded:
             with st.spinner("Summarizing projects via LLM..."):
-                summaries = []
-                for r in loaded:
-                    try:
-                        summaries.append(summarize_project(r, target_role))
-                    except Exception as e:
-                        st.warning(f"Skipped one repo: {e}")
+                summaries, errors = summarize_projects(loaded, target_role)
+                for e in errors:
+                    st.warning(f"Skipped one repo: {e}")
                 st.session_state["summaries"] = summaries
                 st.success(f"✅ Summarized {len(summaries)} projects!")
 
@@ -459,7 +675,6 @@ selected_projects = []
 if st.session_state.get("summaries"):
     st.subheader("🧩 AI-Generated Project Details")
     summaries = st.session_state["summaries"]
-    _user_data_disk = load_user_projects_from_disk()
 
     for i, proj in enumerate(summaries):
         title = proj.get("title", f"Untitled Project {i+1}")
@@ -473,9 +688,9 @@ if st.session_state.get("summaries"):
 
             col1, col2 = st.columns(2)
             with col1:
-                month = st.selectbox("Month", [m for m in range(1, 13)], index=(datetime.now().month - 1), key=f"month_{i}")
+                month = st.selectbox("Month", MONTHS, index=(TODAY.month - 1), key=f"month_{i}")
             with col2:
-                year = st.selectbox("Year", [y for y in range(datetime.now().year - 5, datetime.now().year + 2)], index=5, key=f"year_{i}")
+                year = st.selectbox("Year", YEARS, index=5, key=f"year_{i}")
             formatted_date = f"{month:02d}/{year}"
 
             edit_mode = st.toggle("✏️ Edit Description", key=f"edit_{i}")
@@ -501,8 +716,7 @@ if st.session_state.get("summaries"):
                             features = refined
                             st.success("✅ Description refined successfully!")
                             refined_path = os.path.join(PROJECT_DETAILS_DIR, f"{title}.json")
-                            with open(refined_path, "w", encoding="utf-8") as f:
-                                json.dump({**proj, "features": refined}, f, ensure_ascii=False, indent=2)
+                            write_json_atomic(refined_path, {**proj, "features": refined})
                             update_project_in_session(title, refined)
                             st.rerun()
 
@@ -532,9 +746,13 @@ if st.button("💾 Finish & Save All Changes"):
 st.markdown("---")
 st.header("💼 AI-Powered Job Recommendations & Auto-Apply")
 
-# Services
-job_rec_service = JobRecommendationService()
-job_app_service = JobApplicationService()
+# Services (constructed once per session, not on every rerun)
+if "_job_rec_svc" not in st.session_state:
+    st.session_state["_job_rec_svc"] = JobRecommendationService()
+if "_job_app_svc" not in st.session_state:
+    st.session_state["_job_app_svc"] = JobApplicationService()
+job_rec_service = st.session_state["_job_rec_svc"]
+job_app_service = st.session_state["_job_app_svc"]
 
 user_data = st.session_state.get("user_data", {})
 if not user_data.get("name"):
@@ -560,6 +778,9 @@ else:
                 else:
                     recommended_jobs = job_rec_service.get_recommended_jobs(user_data, max_results=15)
                 st.session_state["recommended_jobs"] = recommended_jobs
+                # Filter options only change with the job list; don't rebuild them per rerun
+                st.session_state["_sources"] = sorted({j.get("source", "Unknown") for j in recommended_jobs})
+                st.session_state["_jobs_df"] = pd.DataFrame(recommended_jobs, columns=["relevance_score", "source", "company"])
                 st.success(f"✅ Found {len(recommended_jobs)} relevant job opportunities!")
             except Exception as e:
                 st.error(f"❌ Error fetching jobs: {e}")
@@ -569,23 +790,30 @@ else:
         st.subheader(f"📋 {len(st.session_state['recommended_jobs'])} Recommended Jobs")
         col1, col2, col3 = st.columns(3)
         with col1:
-            min_score = st.slider("Min Relevance Score", 0, 100, 0)
+            # TF-IDF blending lifts scores past the old 0-100 range; jobs are sorted best-first
+            max_score = max(100, int(st.session_state["recommended_jobs"][0].get("relevance_score") or 0))
+            min_score = st.slider("Min Relevance Score", 0, max_score, 0)
         with col2:
             source_filter = st.multiselect(
                 "Source",
-                options=sorted(list(set([j.get("source", "Unknown") for j in st.session_state["recommended_jobs"]]))),
+                options=st.session_state.get("_sources", []),
                 default=[]
             )
         with col3:
             company_search = st.text_input("Search Company", "")
 
-        filtered_jobs = st.session_state["recommended_jobs"]
-        if min_score > 0:
-            filtered_jobs = [j for j in filtered_jobs if j.get("relevance_score", 0) >= min_score]
+        # Vectorized filters over the cached frame; rows map 1:1 onto the job dicts
+        jobs = st.session_state["recommended_jobs"]
+        df = st.session_state.get("_jobs_df")
+        if df is None or len(df) != len(jobs):
+            df = st.session_state["_jobs_df"] = pd.DataFrame(jobs, columns=["relevance_score", "source", "company"])
+        mask = df["relevance_score"].fillna(0) >= min_score
         if source_filter:
-            filtered_jobs = [j for j in filtered_jobs if j.get("source", "") in source_filter]
+            mask &= df["source"].isin(source_filter)
         if company_search:
-            filtered_jobs = [j for j in filtered_jobs if company_search.lower() in j.get("company", "").lower()]
+            # astype(str): an all-missing column isn't object dtype and has no .str accessor
+            mask &= df["company"].fillna("").astype(str).str.contains(company_search, case=False, regex=False, na=False)
+        filtered_jobs = [jobs[i] for i in mask.to_numpy().nonzero()[0]]
 
         st.session_state["selected_jobs"] = []
         for idx, job in enumerate(filtered_jobs):
@@ -681,37 +909,35 @@ if st.button("🧾 Generate LaTeX Resume"):
             )
         else:
             with st.spinner("🛠️ Compiling LaTeX to PDF..."):
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    tex_path = os.path.join(tmpdir, "resume.tex")
-                    with open(tex_path, "w", encoding="utf-8") as f:
-                        f.write(corrected_tex)
-
-                    result = subprocess.run(
-                        ["pdflatex", "-interaction=nonstopmode", tex_path],
-                        cwd=tmpdir,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE
-                    )
-
-                    pdf_path = os.path.join(tmpdir, "resume.pdf")
-                    if os.path.exists(pdf_path):
-                        with open(pdf_path, "rb") as pdf_file:
-                            pdf_bytes = pdf_file.read()
-
-                        st.download_button("📄 Download .tex", corrected_tex, "resume.tex", "text/x-tex")
-                        st.download_button("📘 Download PDF", pdf_bytes, "resume.pdf", "application/pdf")
-
-                        st.subheader("🔍 Live Resume Preview")
-                        base64_pdf = base64.b64encode(pdf_bytes).decode("utf-8")
-                        pdf_display = f"""
-                        <iframe
-                            src="data:application/pdf;base64,{base64_pdf}"
-                            width="100%" height="850" type="application/pdf">
-                        </iframe>
-                        """
-                        st.markdown(pdf_display, unsafe_allow_html=True)
-                    else:
-                        st.error("❌ PDF generation failed. Check LaTeX syntax below:")
-                        st.text(result.stderr.decode("utf-8"))
+                pdf_path, latex_log = compile_latex_pdf(corrected_tex)
+
+            if pdf_path:
+                if latex_log:
+                    st.warning("⚠️ pdflatex reported recoverable errors; the PDF may be incomplete.")
+                    with st.expander("LaTeX log"):
+                        st.text(latex_log)
+                with open(pdf_path, "rb") as pdf_file:
+                    pdf_bytes = pdf_file.read()
+
+                st.download_button("📄 Download .tex", corrected_tex, "resume.tex", "text/x-tex")
+                st.download_button("📘 Download PDF", pdf_bytes, "resume.pdf", "application/pdf")
+
+                st.subheader("🔍 Live Resume Preview")
+                # Reference the file by URL instead of inlining it as a base64 data URI
+                pdf_display = f"""
+                <iframe
+                    src="{publish_pdf_preview(pdf_path)}"
+                    width="100%" height="850" type="application/pdf">
+                </iframe>
+                """
+                st.markdown(pdf_display, unsafe_allow_html=True)
+            else:
+                st.error("❌ PDF generation failed. Check LaTeX syntax below:")
+                st.text(latex_log)
     except Exception as e:
         st.error(f"Error generating LaTeX: {e}")
+
+# ===============================
+# PERSIST FORM EDITS (once per rerun)
+# ===============================
+flush_user_data()
@@ -0,0 +1,75 @@
+import numpy as np
+
+from backend.app.services import agentic_rag_service
+from backend.app.services.agentic_rag_service import dedup_docs
+from backend.app.services.embedding_service import Doc
+
+VECTORS = {
+    "Python developer at Acme": [1.0, 0.0, 0.0],
+    "Python developer at Acme Corp": [0.98, 0.2, 0.0],
+    "Built a LangChain chatbot": [0.0, 1.0, 0.0],
+    "Kaggle competition winner": [0.0, 0.0, 1.0],
+}
+
+
+def _fake_embed_texts(texts):
+    return [np.asarray(VECTORS[t], dtype="float32") / np.linalg.norm(VECTORS[t]) for t in texts]
+
+
+def test_dedup_drops_near_duplicates(monkeypatch):
+    monkeypatch.setattr(agentic_rag_service, "embed_texts", _fake_embed_texts)
+    docs = [Doc(t) for t in VECTORS]
+    kept = [d.page_content for d in dedup_docs(docs, threshold=0.9)]
+    assert kept == ["Python developer at Acme", "Built a LangChain chatbot", "Kaggle competition winner"]
+
+
+def test_dedup_keeps_everything_below_threshold(monkeypatch):
+    monkeypatch.setattr(agentic_rag_service, "embed_texts", _fake_embed_texts)
+    docs = [Doc(t) for t in VECTORS]
+    assert len(dedup_docs(docs, threshold=0.999)) == 4
+
+
+def test_dedup_short_lists_skip_embedding(monkeypatch):
+    def fail(texts):
+        raise AssertionError("should not embed")
+
+    monkeypatch.setattr(agentic_rag_service, "embed_texts", fail)
+    docs = [Doc("only one")]
+    assert dedup_docs(docs) == docs
+
+
+def _run_pipeline(monkeypatch, verdict):
+    corrections = []
+
+    async def route(query):
+        return "resume"
+
+    async def retrieve(query, source):
+        return "draft"
+
+    async def grade(query, answer):
+        return verdict
+
+    async def correct(query, answer, feedback=""):
+        corrections.append(feedback)
+        return f"fixed: {feedback}"
+
+    monkeypatch.setattr(agentic_rag_service, "route_query", route)
+    monkeypatch.setattr(agentic_rag_service, "retrieve_answer", retrieve)
+    monkeypatch.setattr(agentic_rag_service, "grade_answer", grade)
+    monkeypatch.setattr(agentic_rag_service, "correct_answer", correct)
+    return agentic_rag_service.run_agentic_rag_pipeline("what did I build?"), corrections
+
+
+def test_pipeline_keeps_passing_answer(monkeypatch):
+    assert _run_pipeline(monkeypatch, (True, "")) == ("draft", [])
+
+
+def test_pipeline_corrects_with_grader_feedback(monkeypatch):
+    assert _run_pipeline(monkeypatch, (False, "too vague")) == ("fixed: too vague", ["too vague"])
+
+
+def test_pipeline_falls_back_to_speculative_retry(monkeypatch):
+    verdict = (False, agentic_rag_service.INVALID_GRADE_FEEDBACK)
+    assert _run_pipeline(monkeypatch, verdict) == ("fixed: ", [""])
+
@@ -0,0 +1,52 @@
+import json
+
+from backend.app.utils.file_io import write_json_atomic
+
+
+def test_writes_and_skips_unchanged(tmp_path):
+    path = str(tmp_path / "data.json")
+    assert write_json_atomic(path, {"name": "Zoë", "skills": ["python"]}) is True
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"name": "Zoë", "skills": ["python"]}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+    # Same payload again is a no-op
+    assert write_json_atomic(path, {"name": "Zoë", "skills": ["python"]}) is False
+    assert write_json_atomic(path, {"name": "Zoë", "skills": ["python", "sql"]}) is True
+
+
+def test_rewrites_if_file_was_removed(tmp_path):
+    path = tmp_path / "data.json"
+    write_json_atomic(str(path), [1, 2])
+    path.unlink()
+    assert write_json_atomic(str(path), [1, 2]) is True
+    assert path.exists()
+
+
+def test_falls_back_to_stdlib_json(tmp_path):
+    # orjson rejects non-str keys; other indents are stdlib-only
+    path = tmp_path / "keys.json"
+    write_json_atomic(str(path), {1: "a"})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"1": "a"}
+
+    path = tmp_path / "indent.json"
+    write_json_atomic(str(path), {"a": 1}, indent=4)
+    assert path.read_text(encoding="utf-8") == '{\n    "a": 1\n}'
+
+
+def test_rewrites_if_file_changed_on_disk(tmp_path):
+    path = tmp_path / "data.json"
+    write_json_atomic(str(path), {"a": 1})
+    path.write_text('{"a": 2}', encoding="utf-8")
+    assert write_json_atomic(str(path), {"a": 1}) is True
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 1}
+
+
+def test_concurrent_writers_leave_no_temp_files(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = str(tmp_path / "data.json")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: write_json_atomic(path, {"i": i}), range(64)))
+    assert json.loads((tmp_path / "data.json").read_text(encoding="utf-8"))["i"] in range(64)
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from backend.app.services import job_application_service
+from backend.app.services.job_application_service import JobApplicationService
+
+USER = {"name": "Ada Lovelace", "contact": {"email": "ada@example.com", "phone": "123"}}
+
+
+@pytest.fixture
+def in_tmp(tmp_path, monkeypatch):
+    # The service keeps its logs under a relative data/ directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _schema(fields, requires_file=False, method="post"):
+    return {"action": "https://jobs.example.com/apply", "method": method,
+            "fields": fields, "requires_file": requires_file}
+
+
+def test_direct_submit_posts_application_form(in_tmp, monkeypatch):
+    posted = {}
+
+    class Resp:
+        status_code = 200
+
+    def fake_post(url, data):
+        posted.update(data)
+        return Resp()
+
+    monkeypatch.setattr(job_application_service._HTTP, "post", fake_post)
+    fields = [
+        {"name": "full_name", "id": "", "type": "text", "value": ""},
+        {"name": "email", "id": "", "type": "email", "value": ""},
+        {"name": "csrf", "id": "", "type": "hidden", "value": "tok"},
+    ]
+    assert JobApplicationService()._submit_form_direct(_schema(fields), USER) is True
+    assert posted == {"full_name": "Ada Lovelace", "email": "ada@example.com", "csrf": "tok"}
+
+
+def test_direct_submit_refuses_uploads_and_newsletters(in_tmp, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("should not post")
+
+    monkeypatch.setattr(job_application_service._HTTP, "post", fail)
+    service = JobApplicationService()
+    application = [
+        {"name": "name", "id": "", "type": "text", "value": ""},
+        {"name": "email", "id": "", "type": "email", "value": ""},
+    ]
+    newsletter = [{"name": "email", "id": "", "type": "email", "value": ""}]
+
+    assert service._submit_form_direct(_schema(application, requires_file=True), USER) is False
+    assert service._submit_form_direct(_schema(application, method="get"), USER) is False
+    assert service._submit_form_direct(_schema(newsletter), USER) is False
+
+
+def test_migrates_legacy_log_to_jsonl(in_tmp):
+    (in_tmp / "data").mkdir()
+    legacy = {"applications": [{"job_title": "ML Engineer", "status": "success"},
+                               {"job_title": "Data Scientist", "status": "failed"}]}
+    (in_tmp / "data" / "applications_log.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    service = JobApplicationService()
+
+    assert not (in_tmp / "data" / "applications_log.json").exists()
+    assert (in_tmp / "data" / "applications_log.json.migrated").exists()
+    assert service.get_application_history() == legacy["applications"]
+
+
+def test_log_appends_records(in_tmp):
+    service = JobApplicationService()
+    assert service.get_application_history() == []
+    service.save_application_log([{"job_title": "A"}])
+    service.save_application_log([{"job_title": "B"}])
+    assert [r["job_title"] for r in service.get_application_history()] == ["A", "B"]
+
+
+def test_corrupt_legacy_log_is_moved_aside(in_tmp):
+    (in_tmp / "data").mkdir()
+    (in_tmp / "data" / "applications_log.json").write_text('{"applications": [', encoding="utf-8")
+
+    service = JobApplicationService()
+
+    assert (in_tmp / "data" / "applications_log.json.corrupt").exists()
+    assert not (in_tmp / "data" / "applications_log.json").exists()
+    assert service.get_application_history() == []
+
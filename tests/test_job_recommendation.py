@@ -0,0 +1,60 @@
+from backend.app.services.job_recommendation_service import JobRecommendationService
+
+
+def _job(title, description, company="Acme"):
+    return {"title": title, "description": description, "company": company}
+
+
+def test_tfidf_scores_rank_relevant_jobs_higher():
+    jobs = [
+        _job("Backend Engineer", "Build REST services in Python with Django and PostgreSQL."),
+        _job("Store Manager", "Manage retail staff, inventory and store operations."),
+    ]
+    scores = JobRecommendationService._tfidf_scores(jobs, ["python", "django", "postgresql"])
+    assert scores[0] > 0.1
+    assert scores[1] == 0.0
+
+
+def test_tfidf_scores_use_each_runs_vocabulary():
+    # Fitted per call: terms that only appear in a later run must still score
+    JobRecommendationService._tfidf_scores([_job("Chef", "Cook pasta.")], ["cooking"])
+    scores = JobRecommendationService._tfidf_scores(
+        [_job("Rust Developer", "Write embedded firmware in rust."), _job("Chef", "Cook pasta.")],
+        ["rust", "firmware"],
+    )
+    assert scores[0] > 0 and scores[1] == 0.0
+
+
+def test_tfidf_scores_empty_inputs():
+    assert JobRecommendationService._tfidf_scores([], ["python"]) == []
+    assert JobRecommendationService._tfidf_scores([_job("A", "b")], []) == [0.0]
+
+
+def test_rank_jobs_matches_skills_without_partial_false_positives():
+    jobs = [
+        _job("Frontend Developer", "React and javascript single page apps."),
+        _job("Java Developer", "Spring Boot services in java and kubernetes."),
+    ]
+    profile = {"skills": ["java", "kubernetes"], "job_titles": ["java developer"]}
+    ranked = JobRecommendationService().rank_jobs_by_relevance(jobs, profile)
+
+    assert ranked[0]["title"] == "Java Developer"
+    assert set(ranked[0]["matched_skills"]) == {"java", "kubernetes"}
+    # "java" must not fuzzy-match "javascript"
+    assert ranked[1]["matched_skills"] == []
+
+
+def test_rank_jobs_matches_multi_word_and_dotted_skills():
+    jobs = [_job("ML Engineer", "Machine learning, data structures, CI/CD, Power BI, "
+                                "computer vision and a React.js dashboard.")]
+    skills = ["machine learning", "data structures", "ci/cd", "power bi", "computer vision", "react"]
+    ranked = JobRecommendationService().rank_jobs_by_relevance(jobs, {"skills": skills, "job_titles": []})
+    assert set(ranked[0]["matched_skills"]) == set(skills)
+
+
+def test_rank_jobs_fuzzy_fallback_for_single_token_skills():
+    jobs = [_job("Data Engineer", "Pipelines on postgres and kubernete clusters.")]
+    profile = {"skills": ["postgresql", "kubernetes"], "job_titles": []}
+    ranked = JobRecommendationService().rank_jobs_by_relevance(jobs, profile)
+    assert set(ranked[0]["matched_skills"]) == {"postgresql", "kubernetes"}
+
@@ -0,0 +1,24 @@
+import json
+
+from backend.app.utils.json_block import extract_json_block
+
+
+def test_strips_prose_and_fences():
+    text = 'Sure! ```json\n{"decision": "Pass", "score": 80}\n``` Hope this helps.'
+    assert json.loads(extract_json_block(text)) == {"decision": "Pass", "score": 80}
+
+
+def test_stops_at_matching_brace():
+    # A greedy first-{ .. last-} slice would swallow the trailing "}"
+    text = '{"a": {"b": 1}} and a stray } here'
+    assert extract_json_block(text) == '{"a": {"b": 1}}'
+
+
+def test_ignores_braces_inside_strings():
+    text = 'x {"reason": "uses {braces} and \\"quotes}\\"", "n": 1} y'
+    assert json.loads(extract_json_block(text)) == {"reason": 'uses {braces} and "quotes}"', "n": 1}
+
+
+def test_falls_back_to_text_without_complete_object():
+    assert extract_json_block("  no json here ") == "no json here"
+    assert extract_json_block('{"unbalanced": 1') == '{"unbalanced": 1'
@@ -0,0 +1,104 @@
+import asyncio
+import zlib
+
+import numpy as np
+import pytest
+
+from backend.app.services.semantic_cache import SemanticCache, semantic_cache
+
+DIM = 64
+
+
+def _fake_embed(text: str) -> np.ndarray:
+    """Bag-of-words hashed into a unit vector: shared words -> high cosine."""
+    vec = np.zeros((1, DIM), dtype="float32")
+    for word in text.lower().split():
+        vec[0, zlib.crc32(word.encode()) % DIM] += 1.0
+    return vec / np.linalg.norm(vec)
+
+
+@pytest.fixture
+def embed_calls(monkeypatch):
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        return _fake_embed(text)
+
+    monkeypatch.setattr(SemanticCache, "_embed", staticmethod(embed))
+    return calls
+
+
+def test_exact_and_semantic_hits(embed_calls):
+    cache = SemanticCache(threshold=0.8)
+    assert cache.lookup("what are my python skills")[0] is False
+    cache.store("what are my python skills", "Python, SQL")
+
+    hit, value, vec = cache.lookup("what are my python skills")
+    assert (hit, value, vec) == (True, "Python, SQL", None)
+
+    hit, value, _ = cache.lookup("what are my python skills please")
+    assert (hit, value) == (True, "Python, SQL")
+
+    assert cache.lookup("list my github projects")[0] is False
+
+
+def test_lru_eviction(embed_calls):
+    cache = SemanticCache(threshold=0.99, max_entries=2)
+    cache.store("alpha", 1)
+    cache.store("beta", 2)
+    cache.lookup("alpha")  # alpha is now most recently used
+    cache.store("gamma", 3)
+    assert cache.lookup("beta")[0] is False
+    assert cache.lookup("alpha")[1] == 1
+    assert cache.lookup("gamma")[1] == 3
+
+
+def test_exact_only_never_embeds(embed_calls):
+    cache = SemanticCache(exact_only=True)
+    cache.store("q\nanswer 42", "pass")
+    assert cache.lookup("q\nanswer 42")[1] == "pass"
+    assert cache.lookup("q\nanswer 43")[0] is False
+    assert embed_calls == []
+
+
+def test_decorator_clears_on_version_change(embed_calls):
+    version = {"v": 1}
+    calls = []
+
+    @semantic_cache(threshold=0.9, version=lambda: version["v"])
+    def answer(query):
+        calls.append(query)
+        return f"answer {len(calls)}"
+
+    assert answer("skills") == "answer 1"
+    assert answer("skills") == "answer 1"
+    version["v"] = 2  # e.g. the index was rebuilt
+    assert answer("skills") == "answer 2"
+
+
+def test_async_decorator(embed_calls):
+    calls = []
+
+    @semantic_cache(exact_only=True)
+    async def grade(question, answer):
+        calls.append(answer)
+        return answer == "42"
+
+    async def run():
+        return [await grade("q", "42"), await grade("q", "42"), await grade("q", "43")]
+
+    assert asyncio.run(run()) == [True, True, False]
+    assert calls == ["42", "43"]
+
+
+def test_numbers_and_negations_must_match(embed_calls):
+    cache = SemanticCache(threshold=0.8)
+    cache.store("list my top 3 python projects please", "A, B, C")
+    cache.store("which projects use java", "X")
+
+    assert cache.lookup("list my top 3 python projects")[1] == "A, B, C"
+    assert cache.lookup("list my top 2 python projects please")[0] is False
+    assert cache.lookup("list my top three python projects please")[0] is False
+    assert cache.lookup("which projects do not use java")[0] is False
+    assert cache.lookup("which projects don't use java")[0] is False